@@ -0,0 +1,39 @@
+"""Add composite (email, received_at) index on brevo_email_events
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "013"
+down_revision = "012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Index the registration-page email checks (existence + latest event type).
+    Built concurrently so the webhook inserts are not blocked.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_brevo_email_events_email_received_at "
+            "ON brevo_email_events (email, received_at DESC) "
+            "INCLUDE (event_type)"
+        )
+
+
+def downgrade() -> None:
+    """Drop the composite index"""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            "ix_brevo_email_events_email_received_at"
+        )
@@ -0,0 +1,58 @@
+"""Store password reset tokens as SHA-256 digests
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "014"
+down_revision = "013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Replace the plaintext password_reset_token column with a digest column
+    and a partial unique index covering only users with a pending reset.
+    Outstanding reset links are invalidated (they expire within an hour).
+    """
+    op.add_column(
+        "users",
+        sa.Column("password_reset_token_hash", sa.String(64), nullable=True),
+    )
+    op.drop_index("ix_users_password_reset_token", table_name="users")
+    op.drop_column("users", "password_reset_token")
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_users_password_reset_token_hash "
+            "ON users (password_reset_token_hash) "
+            "WHERE password_reset_token_hash IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    """Restore the plaintext token column"""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_users_password_reset_token_hash"
+        )
+    op.add_column(
+        "users",
+        sa.Column("password_reset_token", sa.String(255), nullable=True, unique=True),
+    )
+    op.create_index(
+        "ix_users_password_reset_token",
+        "users",
+        ["password_reset_token"],
+        unique=True,
+    )
+    op.drop_column("users", "password_reset_token_hash")
@@ -0,0 +1,38 @@
+"""Add full-text GIN index for related-content search
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "015"
+down_revision = "014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    GIN index over the title+description document used by
+    find_related_content. The expression must stay identical to
+    _RELATED_TSVECTOR in app/api/routes/content.py.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_content_items_fts "
+            "ON content_items USING GIN ("
+            "to_tsvector('english', coalesce(title, '') || ' ' || "
+            "coalesce(description, ''))"
+            ")"
+        )
+
+
+def downgrade() -> None:
+    """Drop the full-text index"""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_content_items_fts")
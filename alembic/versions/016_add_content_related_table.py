@@ -0,0 +1,50 @@
+"""Add content_related table for precomputed related articles
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "016"
+down_revision = "015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create content_related (content_id -> related_ids[])"""
+    op.create_table(
+        "content_related",
+        sa.Column("content_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "related_ids",
+            postgresql.ARRAY(sa.Integer()),
+            nullable=False,
+            server_default="{}",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.ForeignKeyConstraint(
+            ["content_id"], ["content_items.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("content_id"),
+    )
+    # The refresh job picks the stalest rows first
+    op.create_index("ix_content_related_updated_at", "content_related", ["updated_at"])
+
+
+def downgrade() -> None:
+    """Drop content_related"""
+    op.drop_index("ix_content_related_updated_at", table_name="content_related")
+    op.drop_table("content_related")
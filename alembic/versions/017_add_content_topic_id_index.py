@@ -0,0 +1,35 @@
+"""Add composite (topic_id, id) index on content_items
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "017"
+down_revision = "016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Serve the per-topic content listing (WHERE topic_id = ? ORDER BY id)
+    as an index range scan. Built concurrently so ingestion is not blocked.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_content_items_topic_id_id "
+            "ON content_items (topic_id, id)"
+        )
+
+
+def downgrade() -> None:
+    """Drop the composite index"""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_content_items_topic_id_id")
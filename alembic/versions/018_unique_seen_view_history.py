@@ -0,0 +1,47 @@
+"""Deduplicate "seen" view history and enforce it with a partial unique index
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "018"
+down_revision = "017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Keep the oldest "seen" row per (session_token, content_id), then add the
+    partial unique index record_view's INSERT ... ON CONFLICT relies on.
+    """
+    op.execute(
+        "DELETE FROM content_view_history newer "
+        "USING content_view_history older "
+        "WHERE newer.view_type = 'seen' AND older.view_type = 'seen' "
+        "AND newer.session_token = older.session_token "
+        "AND newer.content_id = older.content_id "
+        "AND newer.id > older.id"
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_content_view_history_seen_unique "
+            "ON content_view_history (session_token, content_id) "
+            "WHERE view_type = 'seen'"
+        )
+
+
+def downgrade() -> None:
+    """Drop the partial unique index (removed duplicates are not restored)"""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_content_view_history_seen_unique"
+        )
@@ -0,0 +1,40 @@
+"""Add composite covering index for view history pages
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "019"
+down_revision = "018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Serve get_viewed_history (session_token [+ view_type], ORDER BY
+    viewed_at DESC) from the index without a sort. /seen-ids is already
+    covered by ix_content_view_history_seen_unique (migration 018).
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_content_view_history_token_type_viewed "
+            "ON content_view_history (session_token, view_type, viewed_at DESC) "
+            "INCLUDE (content_id, content_slug, time_spent_seconds)"
+        )
+
+
+def downgrade() -> None:
+    """Drop the composite index"""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            "ix_content_view_history_token_type_viewed"
+        )
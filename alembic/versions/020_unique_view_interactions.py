@@ -0,0 +1,82 @@
+"""Collapse duplicate "view" interactions and add a partial unique index
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "020"
+down_revision = "019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Merge repeated "view" rows per (session_id, content_item_id) into the
+    oldest one (keeping the longest duration), then add the partial unique
+    index track_content_interaction's INSERT ... ON CONFLICT relies on.
+
+    This changes what "view" rows count: previously every view was a row,
+    afterwards each row is one session viewing one item. The merged rows
+    are moved to user_interactions_view_duplicates rather than discarded,
+    so total view counts can still be recovered (and downgrade restores
+    them).
+    """
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS user_interactions_view_duplicates "
+        "(LIKE user_interactions)"
+    )
+    op.execute(
+        "UPDATE user_interactions ui "
+        "SET duration_seconds = agg.max_duration "
+        "FROM ("
+        "  SELECT min(id) AS keep_id, max(duration_seconds) AS max_duration "
+        "  FROM user_interactions "
+        "  WHERE interaction_type = 'view' AND session_id IS NOT NULL "
+        "  GROUP BY session_id, content_item_id HAVING count(*) > 1"
+        ") agg "
+        "WHERE ui.id = agg.keep_id"
+    )
+    op.execute(
+        "WITH moved AS ("
+        "  DELETE FROM user_interactions newer "
+        "  USING user_interactions older "
+        "  WHERE newer.interaction_type = 'view' AND older.interaction_type = 'view' "
+        "  AND newer.session_id = older.session_id "
+        "  AND newer.content_item_id = older.content_item_id "
+        "  AND newer.id > older.id "
+        "  RETURNING newer.*"
+        ") "
+        "INSERT INTO user_interactions_view_duplicates SELECT * FROM moved"
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_user_interactions_session_view_unique "
+            "ON user_interactions (session_id, content_item_id) "
+            "WHERE interaction_type = 'view'"
+        )
+
+
+def downgrade() -> None:
+    """
+    Drop the partial unique index and move the archived duplicate views
+    back (kept rows retain their merged, longest duration).
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            "ix_user_interactions_session_view_unique"
+        )
+    op.execute(
+        "INSERT INTO user_interactions "
+        "SELECT * FROM user_interactions_view_duplicates"
+    )
+    op.execute("DROP TABLE user_interactions_view_duplicates")
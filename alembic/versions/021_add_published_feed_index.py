@@ -0,0 +1,39 @@
+"""Add partial (created_at DESC) WHERE is_published index on content_items
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "021"
+down_revision = "020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Serve the feed (WHERE is_published ORDER BY created_at DESC LIMIT n,
+    optionally with a created_at cursor) by walking the index newest first
+    instead of sorting every published row. Built concurrently so ingestion
+    is not blocked.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_content_items_published_created_at "
+            "ON content_items (created_at DESC) WHERE is_published"
+        )
+
+
+def downgrade() -> None:
+    """Drop the partial index"""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_content_items_published_created_at"
+        )
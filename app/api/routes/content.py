@@ -1,4 +1,5 @@
 import asyncio
+import hashlib
 import time
 import logging
 import secrets
@@ -10,37 +11,81 @@ from datetime import datetime, timezone
 from urllib.parse import urlparse
 from io import BytesIO
 
-from fastapi import APIRouter, HTTPException, Depends, Query, Request, Cookie
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    HTTPException,
+    Depends,
+    Query,
+    Request,
+    Cookie,
+)
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, distinct, or_, and_, func
-from pydantic import BaseModel
+from sqlalchemy import (
+    select,
+    distinct,
+    exists,
+    or_,
+    and_,
+    func,
+    case,
+    literal_column,
+    Row,
+)
+from sqlalchemy.orm import joinedload, selectinload
+from pydantic import BaseModel, TypeAdapter
+
+import orjson
 
+from app.core.cache import FEED_CACHE_PREFIX, RELATED_CACHE_PREFIX, response_cache
+from app.core.config import settings
 from app.db import AsyncSessionLocal
 from app.api.v1.deps import get_db
 from app.models import ContentItem, Topic
-from app.schemas import (
-    ContentItem as ContentItemSchema,
-    ContentWithTopic,
-    Topic as TopicSchema,
-)
+from app.schemas import ContentWithTopic
 from app.services.content_recommendation import recommendation_service
 from app.services.article_scraper import article_scraper
 from app.services.deduplication import deduplication_service
 from app.services.rss_discovery import rss_discovery_service
+from app.services.related_content import RELATED_ITEM_COLUMNS, get_precomputed_related
 from app.core.input_validation import (
     InputValidator,
     validate_request_data,
     get_safe_user_input,
 )
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # In-memory cache for thumbnail fetch attempts (content_id -> (picture_url, timestamp))
 # Prevents hammering the database/scraper for items without pictures
 _thumbnail_cache: dict[int, tuple[Optional[str], float]] = {}
 _THUMBNAIL_CACHE_TTL = 300  # 5 minutes
 
+# Anonymous /feed responses are shared; matches the Cache-Control max-age
+FEED_CACHE_TTL = 60
+
+# Full-text document for related-content search. Kept as literal SQL so it
+# matches the GIN expression index ix_content_items_fts (migration 015)
+# exactly; bound parameters would prevent the planner from using it.
+_RELATED_TSVECTOR = literal_column(
+    "to_tsvector('english', coalesce(content_items.title, '') || ' ' || "
+    "coalesce(content_items.description, ''))"
+)
+# Added to ts_rank_cd for items from a different source than the article
+_RELATED_SOURCE_BONUS = 0.3
+# Related items only change when new content is ingested (which clears them)
+RELATED_CACHE_TTL = 900
+
+# Validates/serializes a whole content page in one pydantic-core call
+_CONTENT_LIST_ADAPTER = TypeAdapter(List[ContentWithTopic])
+
+# Columns returned by /topic/{topic_id}; the binary thumbnail is served by
+# /thumbnail/{content_id} and can't be JSON-encoded anyway
+_TOPIC_CONTENT_COLUMNS = tuple(
+    column for column in ContentItem.__table__.c if column.key != "image_data"
+)
+
 # Constants
 LOGGER_NAME = "uvicorn.error"
 CONTENT_NOT_FOUND = "Content not found"
@@ -69,6 +114,8 @@ ERROR_UNABLE_TO_FETCH_IMAGE = "Unable to fetch image"
 ERROR_FAILED_TO_SERVE_IMAGE = "Failed to serve image"
 ERROR_FAILED_TO_FETCH_THUMBNAIL = "Failed to fetch thumbnail"
 
+logger = logging.getLogger(LOGGER_NAME)
+
 
 class CategoriesResponse(BaseModel):
     categories: List[str]
@@ -194,10 +241,25 @@ def _build_response_data(page, page_size, result, session_token):
     }
 
 
-def _create_cached_response(response_data):
-    """Create cached JSON response for public feeds."""
-    return JSONResponse(
-        content=response_data,
+def _feed_cache_key(page, page_size, excluded_ids, category_list, cursor) -> str:
+    """Cache key for an anonymous feed page (hashed; exclude_ids can be long)."""
+    raw = "|".join(
+        (
+            str(page),
+            str(page_size),
+            ",".join(sorted(category_list or [])),
+            ",".join(map(str, excluded_ids or [])),
+            cursor or "",
+        )
+    )
+    return FEED_CACHE_PREFIX + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _create_cached_response(body: bytes):
+    """Create cached JSON response for public feeds from a serialized body."""
+    return Response(
+        content=body,
+        media_type="application/json",
         headers={
             "Cache-Control": "public, max-age=60",
             "Vary": "Accept-Encoding",
@@ -205,7 +267,7 @@ def _create_cached_response(response_data):
     )
 
 
-@router.get("/feed")
+@router.get("/feed", response_class=ORJSONResponse)
 async def get_feed(
     request: Request,
     db: AsyncSession = Depends(get_db),
@@ -228,6 +290,15 @@ async def get_feed(
 
     _log_feed_request(logger, page, category_list, exclude_ids, cursor)
 
+    cache_key = None
+    if session_token is None:
+        cache_key = _feed_cache_key(
+            page, page_size, excluded_ids, category_list, cursor
+        )
+        cached_body = await response_cache.get(cache_key)
+        if cached_body is not None:
+            return _create_cached_response(cached_body)
+
     result = await _get_feed_data(
         db,
         page_size,
@@ -242,11 +313,13 @@ async def get_feed(
 
     response_data = _build_response_data(page, page_size, result, session_token)
 
-    return (
-        _create_cached_response(response_data)
-        if session_token is None
-        else response_data
-    )
+    if cache_key is None:
+        # Returned as a response so FastAPI skips the jsonable_encoder pass
+        return ORJSONResponse(response_data)
+
+    body = orjson.dumps(response_data)
+    await response_cache.set(cache_key, body, FEED_CACHE_TTL)
+    return _create_cached_response(body)
 
 
 def _find_articles_to_scrape(items: list) -> list:
@@ -309,46 +382,66 @@ async def get_trending_feed_endpoint():
     raise HTTPException(status_code=404, detail="Trending disabled")
 
 
-@router.get("/", response_model=List[ContentWithTopic])
+def _next_cursor_headers(last_id: Optional[int], page_size: int, limit: int) -> dict:
+    """X-Next-Cursor header for keyset pagination when the page was full."""
+    if last_id is None or page_size < limit:
+        return {}
+    return {"X-Next-Cursor": str(last_id)}
+
+
+@router.get("/", response_model=List[ContentWithTopic], response_class=ORJSONResponse)
 async def get_content_items(
-    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[int] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Get all content items with their topics"""
-    result = await db.execute(
-        select(ContentItem, Topic)
-        .join(Topic, ContentItem.topic_id == Topic.id)
+    """
+    Get all content items with their topics.
+
+    Pass the previous page's X-Next-Cursor header as ``after`` for keyset
+    pagination (id order); ``skip`` is kept for existing clients.
+    """
+    # Topics are batch-loaded with one IN query. The page is validated and
+    # dumped to JSON in a single TypeAdapter pass; response_model stays for
+    # the OpenAPI schema but is bypassed since a Response is returned.
+    query = (
+        select(ContentItem)
+        .options(selectinload(ContentItem.topic))
         .where(ContentItem.title.isnot(None))  # Skip records with NULL titles
-        .offset(skip)
-        .limit(limit)
+        .order_by(ContentItem.id)
     )
+    if after is not None:
+        query = query.where(ContentItem.id > after)
+    result = await db.execute(query.offset(skip).limit(limit))
 
-    content_items = []
-    for content_item, topic in result.all():
-        content_dict = ContentItemSchema.model_validate(content_item).model_dump()
-        content_dict["topic"] = TopicSchema.model_validate(topic).model_dump()
-        content_items.append(content_dict)
-
-    return content_items
+    items = _CONTENT_LIST_ADAPTER.validate_python(
+        list(result.scalars()), from_attributes=True
+    )
+    return Response(
+        _CONTENT_LIST_ADAPTER.dump_json(items),
+        media_type="application/json",
+        headers=_next_cursor_headers(
+            items[-1].id if items else None, len(items), limit
+        ),
+    )
 
 
 @router.get("/{content_id}", response_model=ContentWithTopic)
 async def get_content_item(content_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific content item with its topic"""
+    # Single row, so the topic is joined in the same statement
     result = await db.execute(
-        select(ContentItem, Topic)
-        .join(Topic, ContentItem.topic_id == Topic.id)
+        select(ContentItem)
+        .options(joinedload(ContentItem.topic, innerjoin=True))
         .where(ContentItem.id == content_id)
     )
 
-    row = result.first()
-    if not row:
+    content_item = result.scalar_one_or_none()
+    if not content_item:
         raise HTTPException(status_code=404, detail="Content item not found")
 
-    content_item, topic = row
-    content_dict = ContentItemSchema.model_validate(content_item).model_dump()
-    content_dict["topic"] = TopicSchema.model_validate(topic).model_dump()
-
-    return content_dict
+    return content_item
 
 
 def _get_cached_content(content: ContentItem) -> Optional[dict]:
@@ -712,7 +805,7 @@ async def _save_scraped_content(
         await db.rollback()
 
 
-def _format_related_items(related_items: List[ContentItem]) -> List[dict]:
+def _format_related_items(related_items: List[Row]) -> List[dict]:
     """Format related content items for API response."""
     return [
         {
@@ -734,8 +827,18 @@ def _format_related_items(related_items: List[ContentItem]) -> List[dict]:
 
 
 @router.get("/article/{content_id}")
-async def get_article_content(content_id: int, db: AsyncSession = Depends(get_db)):
-    """Fetch and return the full article content for a content item."""
+async def get_article_content(
+    content_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Fetch and return the full article content for a content item.
+
+    related_items is filled only when already cached; otherwise it is empty
+    and the related items are computed after the response is sent, ready for
+    GET /article/{content_id}/related.
+    """
     content = await _get_content_or_404(content_id, db)
 
     if _has_scraped_content(content):
@@ -743,13 +846,27 @@ async def get_article_content(content_id: int, db: AsyncSession = Depends(get_db
     else:
         article_data = await _scrape_article_content(content, content_id, db)
 
-    # Find related content
-    related_items = await _get_related_items_safely(db, content)
-    article_data["related_items"] = _format_related_items(related_items)
+    cached_related = await response_cache.get(_related_cache_key(content_id))
+    if cached_related is not None:
+        article_data["related_items"] = orjson.loads(cached_related)
+    else:
+        article_data["related_items"] = []
+        background_tasks.add_task(_warm_related_items, content_id)
 
     return article_data
 
 
+@router.get("/article/{content_id}/related")
+async def get_article_related(content_id: int, db: AsyncSession = Depends(get_db)):
+    """Related items for an article, usually warmed by /article/{content_id}."""
+    cached_related = await response_cache.get(_related_cache_key(content_id))
+    if cached_related is not None:
+        return {"related_items": orjson.loads(cached_related)}
+
+    content = await _get_content_or_404(content_id, db)
+    return {"related_items": await _compute_related_items(db, content)}
+
+
 async def _get_content_or_404(content_id: int, db: AsyncSession) -> ContentItem:
     """Get content item or raise 404."""
     result = await db.execute(select(ContentItem).where(ContentItem.id == content_id))
@@ -825,14 +942,39 @@ async def _scrape_article_content(
     return article_data
 
 
-async def _get_related_items_safely(db: AsyncSession, content: ContentItem) -> list:
-    """Get related items, handling errors."""
+def _related_cache_key(content_id: int) -> str:
+    """Response-cache key for an article's formatted related items."""
+    return f"{RELATED_CACHE_PREFIX}{content_id}:v1"
+
+
+async def _compute_related_items(db: AsyncSession, content: ContentItem) -> List[dict]:
+    """Look up and format related items, storing them in the response cache."""
     try:
-        return await find_related_content(db, content)
+        # Precomputed by the scheduler; items without a row are searched live
+        related_items = await get_precomputed_related(db, content.id)
+        if related_items is None:
+            related_items = await find_related_content(db, content)
     except Exception as e:
-        print(f"❌ Error finding related content: {e}")
+        # Don't cache failures; the next view retries the lookup
+        logger.error("Error finding related content: %s", e)
         return []
 
+    formatted = _format_related_items(related_items)
+    await response_cache.set(
+        _related_cache_key(content.id), orjson.dumps(formatted), RELATED_CACHE_TTL
+    )
+    return formatted
+
+
+async def _warm_related_items(content_id: int) -> None:
+    """Background task: fill the related-items cache after the response."""
+    # The request's session (and the instance it loaded) is closed by now,
+    # so reload the row in a dedicated one
+    async with AsyncSessionLocal() as related_db:
+        content = await related_db.get(ContentItem, content_id)
+        if content is not None:
+            await _compute_related_items(related_db, content)
+
 
 @router.get("/thumbnail/{content_id}", response_model=ThumbnailResponse)
 async def get_thumbnail(content_id: int, db: AsyncSession = Depends(get_db)):
@@ -1212,27 +1354,9 @@ def _resize_image_if_needed(
     return image_data, content_type
 
 
-def _extract_keywords(title: str) -> tuple[List[str], List[str]]:
-    """Extract proper nouns and other significant keywords from title."""
-    original_words = title.split()
-    proper_nouns = [
-        word.strip(".,!?:;\"'-()[]{}").lower()
-        for word in original_words
-        if word and word[0].isupper()
-    ]
-
-    other_keywords = [
-        word.strip(".,!?:;\"'-()[]{}").lower()
-        for word in original_words
-        if len(word) > 2 and not word[0].isupper()
-    ]
-
-    return proper_nouns, other_keywords
-
-
-def _filter_stop_words(proper_nouns: List[str], other_keywords: List[str]) -> List[str]:
-    """Filter stop words and return priority keywords."""
-    stop_words = {
+# Words ignored when picking related-content keywords
+_STOP_WORDS: frozenset[str] = frozenset(
+    {
         "the",
         "and",
         "for",
@@ -1251,7 +1375,31 @@ def _filter_stop_words(proper_nouns: List[str], other_keywords: List[str]) -> Li
         "called",
         "begging",
     }
-    all_keywords = [w for w in (proper_nouns + other_keywords) if w not in stop_words]
+)
+# Most keywords OR'd into a related-content search; more only widens the scan
+_MAX_RELATED_KEYWORDS = 4
+
+# Title tokens: runs of letters/digits (Unicode-aware); inner apostrophes and
+# dots are kept so "Trump's" and "U.S." stay single tokens
+_TOKEN_RE = re.compile(r"[^\W_]+(?:['.][^\W_]+)*")
+
+
+def _extract_keywords(title: str) -> tuple[List[str], List[str]]:
+    """Extract proper nouns and other significant keywords from title."""
+    proper_nouns = []
+    other_keywords = []
+    for word in _TOKEN_RE.findall(title):
+        if word[0].isupper():
+            proper_nouns.append(word.lower())
+        elif len(word) > 2:
+            other_keywords.append(word.lower())
+
+    return proper_nouns, other_keywords
+
+
+def _filter_stop_words(proper_nouns: List[str], other_keywords: List[str]) -> List[str]:
+    """Filter stop words and return priority keywords."""
+    all_keywords = [w for w in (proper_nouns + other_keywords) if w not in _STOP_WORDS]
     return proper_nouns[:8] if proper_nouns else all_keywords[:8]
 
 
@@ -1267,27 +1415,48 @@ def _build_search_conditions(
     return conditions
 
 
+def _build_keyword_bits(
+    proper_nouns: List[str], other_keywords: List[str]
+) -> tuple[List[tuple[str, int]], int, int]:
+    """
+    Assign one bit per keyword for mask-based scoring.
+
+    Returns (keyword, bit) pairs plus the proper-noun and other-keyword masks.
+    Bits are per position, so a word in both lists is counted in both.
+    """
+    keywords = proper_nouns + other_keywords
+    keyword_bits = [(keyword, 1 << i) for i, keyword in enumerate(keywords)]
+    proper_mask = (1 << len(proper_nouns)) - 1
+    other_mask = ((1 << len(keywords)) - 1) ^ proper_mask
+    return keyword_bits, proper_mask, other_mask
+
+
 def _calculate_match_score(
-    item: ContentItem,
-    proper_nouns: List[str],
-    other_keywords: List[str],
+    item: Row,
+    keyword_bits: List[tuple[str, int]],
+    proper_mask: int,
+    other_mask: int,
     content: ContentItem,
 ) -> int:
     """Calculate relevance score for a candidate match."""
-    score = 0
     item_title_lower = item.title.lower() if item.title else ""
     item_desc_lower = item.description.lower() if item.description else ""
 
-    # Score based on keyword matches
-    for keyword in proper_nouns:
+    # One bitmap per field, then popcounts: proper nouns score 2 in the title
+    # and 1 in the description; other keywords score 1 if found in either
+    title_mask = 0
+    desc_mask = 0
+    for keyword, bit in keyword_bits:
         if keyword in item_title_lower:
-            score += 2
+            title_mask |= bit
         if keyword in item_desc_lower:
-            score += 1
+            desc_mask |= bit
 
-    for keyword in other_keywords:
-        if keyword in item_title_lower or keyword in item_desc_lower:
-            score += 1
+    score = (
+        2 * (title_mask & proper_mask).bit_count()
+        + (desc_mask & proper_mask).bit_count()
+        + ((title_mask | desc_mask) & other_mask).bit_count()
+    )
 
     # Bonus for different source
     if content.source_metadata and item.source_metadata:
@@ -1299,33 +1468,62 @@ def _calculate_match_score(
     return score
 
 
-async def find_related_content(
-    db: AsyncSession, content: ContentItem, limit: int = 5
-) -> List[ContentItem]:
-    """Find related content items based on title similarity and keywords."""
-    # Extract and filter keywords
-    proper_nouns, other_keywords = _extract_keywords(content.title)
-    priority_keywords = _filter_stop_words(proper_nouns, other_keywords)
-
-    if not priority_keywords:
+def _build_tsquery_text(priority_keywords: List[str]) -> str:
+    """OR together keywords as a to_tsquery string, dropping unsafe tokens."""
+    terms = []
+    for keyword in priority_keywords:
+        term = re.sub(r"[^a-z0-9]", "", keyword.lower())
+        if term:
+            terms.append(term)
+    return " | ".join(terms)
+
+
+async def _find_related_by_fts(
+    db: AsyncSession, content: ContentItem, priority_keywords: List[str], limit: int
+) -> List[Row]:
+    """Rank related items in PostgreSQL with full-text search."""
+    query_text = _build_tsquery_text(priority_keywords)
+    if not query_text:
         return []
 
-    safe_title = "".join(
-        c for c in str(content.title)[:200] if c.isprintable() and c not in "\n\r\t"
-    )
-    safe_keywords = "".join(
-        c for c in str(priority_keywords)[:200] if c.isprintable() and c not in "\n\r\t"
-    )
-    print(
-        "🔍 Finding related content for '%s' using keywords: %s",
-        safe_title,
-        safe_keywords,
+    tsquery = func.to_tsquery(literal_column("'english'"), query_text)
+    content_source = (content.source_metadata or {}).get("source", "")
+    score = func.ts_rank_cd(_RELATED_TSVECTOR, tsquery)
+    if content.source_metadata:
+        score = score + case(
+            (
+                func.coalesce(ContentItem.source_metadata["source"].as_string(), "")
+                != content_source,
+                _RELATED_SOURCE_BONUS,
+            ),
+            else_=0.0,
+        )
+
+    result = await db.execute(
+        select(*RELATED_ITEM_COLUMNS)
+        .where(
+            ContentItem.id != content.id,
+            ContentItem.is_published == True,
+            _RELATED_TSVECTOR.op("@@")(tsquery),
+        )
+        .order_by(score.desc())
+        .limit(limit)
     )
+    return result.all()
 
-    # Build and execute query
+
+async def _find_related_by_keywords(
+    db: AsyncSession,
+    content: ContentItem,
+    proper_nouns: List[str],
+    other_keywords: List[str],
+    priority_keywords: List[str],
+    limit: int,
+) -> List[Row]:
+    """Substring-match candidates in SQL and score them in Python."""
     conditions = _build_search_conditions(priority_keywords, content)
     result = await db.execute(
-        select(ContentItem)
+        select(*RELATED_ITEM_COLUMNS)
         .where(
             and_(
                 ContentItem.id != content.id,
@@ -1336,30 +1534,116 @@ async def find_related_content(
         .limit(limit * 2)
     )
 
-    candidates = result.scalars().all()
+    candidates = result.all()
 
     # Score and sort matches
+    keyword_bits, proper_mask, other_mask = _build_keyword_bits(
+        proper_nouns, other_keywords
+    )
     scored_matches = []
     for item in candidates:
-        score = _calculate_match_score(item, proper_nouns, other_keywords, content)
+        score = _calculate_match_score(
+            item, keyword_bits, proper_mask, other_mask, content
+        )
         if score > 0:
             scored_matches.append((score, item))
 
     scored_matches.sort(key=lambda x: x[0], reverse=True)
-    related = [item for score, item in scored_matches[:limit]]
+    return [item for score, item in scored_matches[:limit]]
+
+
+async def find_related_content(
+    db: AsyncSession, content: ContentItem, limit: int = 5
+) -> List[Row]:
+    """
+    Find related content items based on title similarity and keywords.
+
+    Returns rows of RELATED_ITEM_COLUMNS (attribute access like ContentItem).
+    """
+    if not content.title:
+        return []
+
+    # Extract and filter keywords
+    proper_nouns, other_keywords = _extract_keywords(content.title)
+    priority_keywords = _filter_stop_words(proper_nouns, other_keywords)
+
+    # A single common word matches too broadly to be worth a search
+    if len(priority_keywords) < 2 and not proper_nouns:
+        return []
 
-    print(f"✅ Found {len(related)} related items")
+    # Keep the longest (usually most specific) keywords to bound the OR scan
+    if len(priority_keywords) > _MAX_RELATED_KEYWORDS:
+        priority_keywords = sorted(priority_keywords, key=len, reverse=True)[
+            :_MAX_RELATED_KEYWORDS
+        ]
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        safe_title = "".join(
+            c for c in str(content.title)[:200] if c.isprintable() and c not in "\n\r\t"
+        )
+        safe_keywords = "".join(
+            c
+            for c in str(priority_keywords)[:200]
+            if c.isprintable() and c not in "\n\r\t"
+        )
+        logger.debug(
+            "Finding related content for '%s' using keywords: %s",
+            safe_title,
+            safe_keywords,
+        )
+
+    if settings.RELATED_CONTENT_FTS:
+        related = await _find_related_by_fts(db, content, priority_keywords, limit)
+    else:
+        related = await _find_related_by_keywords(
+            db, content, proper_nouns, other_keywords, priority_keywords, limit
+        )
+
+    if debug:
+        logger.debug("Found %d related items", len(related))
     return related
 
 
 @router.get("/topic/{topic_id}")
-async def get_content_by_topic(topic_id: int, db: AsyncSession = Depends(get_db)):
-    """Get all content for a specific topic"""
-    result = await db.execute(
-        select(ContentItem).where(ContentItem.topic_id == topic_id)
+async def get_content_by_topic(
+    topic_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    after: Optional[int] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get content for a specific topic (paginated by ``after`` id or ``skip``)"""
+    query = select(*_TOPIC_CONTENT_COLUMNS).where(ContentItem.topic_id == topic_id)
+    if after is not None:
+        query = query.where(ContentItem.id > after)
+
+    # Rows are streamed from a server-side cursor as plain mappings and
+    # encoded in one orjson call; no ORM objects are built for the page.
+    result = await db.stream(
+        query.order_by(ContentItem.id)
+        .offset(skip)
+        .limit(limit)
+        .execution_options(yield_per=50)
+    )
+    content_items = [dict(row) async for row in result.mappings()]
+
+    # Only an empty first page needs the topic probe, to tell "unknown topic"
+    # apart from "topic without content"; the common case is one query.
+    if not content_items and skip == 0 and after is None:
+        topic_exists = await db.scalar(select(exists().where(Topic.id == topic_id)))
+        if not topic_exists:
+            raise HTTPException(status_code=404, detail="Topic not found")
+
+    return Response(
+        orjson.dumps(content_items),
+        media_type="application/json",
+        headers=_next_cursor_headers(
+            content_items[-1]["id"] if content_items else None,
+            len(content_items),
+            limit,
+        ),
     )
-    content_items = result.scalars().all()
-    return content_items
 
 
 @router.get("/preferences/analyze")
@@ -1,3 +1,6 @@
+import logging
+import secrets
+
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,6 +17,9 @@ from app.services.session_service import (
     get_session_history,
     migrate_session_to_user,
 )
+from app.services.interaction_buffer import interaction_buffer
+
+logger = logging.getLogger(__name__)
 
 # Single router instance for all session routes
 router = APIRouter()
@@ -31,17 +37,21 @@ class InterestEvent(BaseModel):
     timestamp: Optional[str] = None
 
 
-@router.post("/track-interest")
+@router.post("/track-interest", status_code=202)
 async def track_content_interest(
     interest: InterestEvent,
     request: Request,
     response: Response,
-    db: AsyncSession = Depends(get_db),
 ):
-    """Track when a user shows interest in content (e.g., hover/click)"""
-    import logging
-
-    session_token = get_session_token(request)
+    """
+    Track when a user shows interest in content (e.g., hover/click).
+
+    Events are queued and written in batches by the interaction buffer, so
+    this handler never touches the database. Only the interaction itself is
+    buffered; the hover metadata (score, duration, movement, ...) is not
+    stored and is only logged at debug level.
+    """
+    session_token = get_session_token(request) or new_session_token()
     visitor_id = request.cookies.get("visitor_id")
 
     # Validate visitor_id before using it
@@ -58,36 +68,41 @@ async def track_content_interest(
             samesite="lax",
         )
 
-    logging.debug(
-        f"[track-interest] visitor_id={visitor_id}, session_token={session_token}, content_id={interest.content_id}"
-    )
-
-    try:
-        await track_content_interaction(
-            db,
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "[track-interest] visitor_id=%s, session_token=%s, content_id=%s, "
+            "metadata=%s",
+            visitor_id,
             session_token,
             interest.content_id,
-            interaction_type="interest",
-            metadata=interest.model_dump(exclude_none=True),
-        )
-        return {
-            "status": "tracked",
-            "session_token": session_token,
-            "visitor_id": visitor_id,
-            "content_id": interest.content_id,
-        }
-    except Exception as e:
-        logging.error(f"[track-interest] Error: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail=f"Tracking interest failed: {str(e)}"
+            interest.model_dump(exclude_none=True),
         )
 
+    queued = interaction_buffer.enqueue(
+        session_token, interest.content_id, interaction_type="interest"
+    )
+    if not queued:
+        logger.warning("[track-interest] Buffer full, event dropped")
+
+    return {
+        "status": "tracked" if queued else "dropped",
+        "session_token": session_token,
+        "visitor_id": visitor_id,
+        "content_id": interest.content_id,
+    }
+
 
 # Note: get_db imported from app.db is reused across routes
 
 
-def get_session_token(request: Request) -> str:
-    """Get or create session token from cookies or headers"""
+def get_session_token(request: Request) -> Optional[str]:
+    """
+    Get the session token from cookies or headers.
+
+    Returns None when the client has no session yet; read-only endpoints
+    treat that as an empty session, and endpoints that record activity mint
+    one with new_session_token().
+    """
     # Try to get from cookies first
     session_token: str | None = request.cookies.get("nexus_session")
 
@@ -97,25 +112,13 @@ def get_session_token(request: Request) -> str:
         if auth_header and auth_header.startswith("Session "):
             session_token = auth_header.replace("Session ", "")
 
-    # If still no token, create one (frontend will need to store it)
-    if not session_token:
-        import uuid
-
-        session_token = str(uuid.uuid4())
-
     # Always validate the session token before use
-    validated_token = InputValidator.validate_session_token(session_token)
+    return InputValidator.validate_session_token(session_token)
 
-    # Ensure we always return a valid token (validation should not return None after creation)
-    if not validated_token:
-        import uuid
 
-        session_token = str(uuid.uuid4())
-        validated_token = InputValidator.validate_session_token(session_token)
-        if not validated_token:
-            raise ValueError("Failed to generate valid session token")
-
-    return validated_token
+def new_session_token() -> str:
+    """Create a session token (frontend will need to store it)"""
+    return secrets.token_urlsafe(16)  # 128 bits, 22 URL-safe chars
 
 
 @router.post("/track-view/{content_id}")
@@ -130,7 +133,7 @@ async def track_content_view(
     content_id = InputValidator.validate_integer(
         content_id, min_val=1, max_val=999999999
     )
-    session_token = get_session_token(request)
+    session_token = get_session_token(request) or new_session_token()
 
     # Ensure the session token is persisted for subsequent calls
     if not request.cookies.get("nexus_session") and session_token:
@@ -158,7 +161,7 @@ async def get_user_history(request: Request, db: AsyncSession = Depends(get_db))
     session_token = get_session_token(request)
 
     try:
-        history = await get_session_history(db, session_token)
+        history = await get_session_history(db, session_token) if session_token else []
 
         return {
             "history": history,
@@ -178,7 +181,11 @@ async def migrate_session_to_user_account(
     session_token = get_session_token(request)
 
     try:
-        migrated_count = await migrate_session_to_user(db, session_token, user_id)
+        migrated_count = (
+            await migrate_session_to_user(db, session_token, user_id)
+            if session_token
+            else 0
+        )
 
         return {
             "message": f"Successfully migrated {migrated_count} history items to your account",
@@ -192,6 +199,14 @@ async def migrate_session_to_user_account(
 async def get_session_info(request: Request, db: AsyncSession = Depends(get_db)):
     """Get information about current session"""
     session_token = get_session_token(request)
+    if not session_token:
+        return {
+            "session_token": None,
+            "session_created": None,
+            "history_count": 0,
+            "is_anonymous": True,
+            "warning": "Anonymous session - data may be lost if cookies are cleared",
+        }
 
     try:
         session = await create_anonymous_session(db, session_token)
@@ -1,33 +1,87 @@
-from fastapi import APIRouter, HTTPException, Depends  # type: ignore
+from fastapi import APIRouter, HTTPException, Depends, Query, Response  # type: ignore
+from fastapi.responses import ORJSONResponse  # type: ignore
 from sqlalchemy.ext.asyncio import AsyncSession  # pyright: ignore[reportMissingImports]
-from sqlalchemy import select  # pyright: ignore[reportMissingImports]
-from typing import List
+from sqlalchemy import exists, insert, select  # pyright: ignore[reportMissingImports]
+from sqlalchemy.exc import IntegrityError  # pyright: ignore[reportMissingImports]
+from sqlalchemy.orm import defer, selectinload  # pyright: ignore[reportMissingImports]
+from typing import List, Optional
+from pydantic import TypeAdapter
+from app.core.cache import TOPICS_CACHE_PREFIX, response_cache
 from app.core.input_validation import InputValidator
+from app.utils.slug import normalize_topic_title
 
 from app.api.v1.deps import get_db
 from app.models import Topic, ContentItem
 from app.schemas import Topic as TopicSchema, TopicWithContent
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Topic pages are identical for every caller; create_topic and the trends
+# refresh clear them
+TOPICS_CACHE_TTL = 60
+_TOPIC_LIST_ADAPTER = TypeAdapter(List[TopicSchema])
+
+
+def _topics_response(cursor: bytes, body: bytes) -> Response:
+    headers = {"X-Next-Cursor": cursor.decode()} if cursor else None
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @router.get("/", response_model=List[TopicSchema])
 async def get_topics(
-    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[int] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Get all topics with pagination"""
-    result = await db.execute(select(Topic).offset(skip).limit(limit))
-    topics = result.scalars().all()
-    return topics
+    """
+    Get all topics with pagination.
+
+    Pass the previous page's X-Next-Cursor header as ``after`` for keyset
+    pagination (id order); ``skip`` is kept for existing clients.
+    """
+    # Cached as b"<next cursor>\n<json body>"; compact JSON has no newlines
+    cache_key = f"{TOPICS_CACHE_PREFIX}{skip}:{limit}:{after}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        cursor, _, body = cached.partition(b"\n")
+        return _topics_response(cursor, body)
+
+    query = select(Topic).order_by(Topic.id)
+    if after is not None:
+        query = query.where(Topic.id > after)
+    result = await db.execute(query.offset(skip).limit(limit))
+    topics = _TOPIC_LIST_ADAPTER.validate_python(
+        list(result.scalars()), from_attributes=True
+    )
+    # Only a full page can have a next one
+    cursor = str(topics[-1].id).encode() if topics and len(topics) == limit else b""
+    body = _TOPIC_LIST_ADAPTER.dump_json(topics)
+    await response_cache.set(cache_key, cursor + b"\n" + body, TOPICS_CACHE_TTL)
+    return _topics_response(cursor, body)
 
 
 @router.get("/{topic_id}", response_model=TopicWithContent)
-async def get_topic(topic_id: int, db: AsyncSession = Depends(get_db)):
+async def get_topic(
+    topic_id: int,
+    include_unpublished: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
     """Get a specific topic with its content"""
     # Validate topic_id
     topic_id = InputValidator.validate_integer(topic_id, min_val=1, max_val=999999999)
-    
-    result = await db.execute(select(Topic).where(Topic.id == topic_id))
+
+    # content_items is serialized by TopicWithContent, so load it up front in
+    # one IN query (a lazy load can't run under AsyncSession); the
+    # is_published filter and image_data deferral happen in SQL
+    content_items = Topic.content_items
+    if not include_unpublished:
+        content_items = content_items.and_(ContentItem.is_published.is_(True))
+    result = await db.execute(
+        select(Topic)
+        .where(Topic.id == topic_id)
+        .options(selectinload(content_items).options(defer(ContentItem.image_data)))
+    )
     topic = result.scalar_one_or_none()
 
     if not topic:
@@ -44,18 +98,29 @@ async def create_topic(topic_data: dict, db: AsyncSession = Depends(get_db)):
     description = InputValidator.validate_xss_safe(topic_data.get("description", ""))
     category = InputValidator.validate_xss_safe(topic_data.get("category", ""))
     
-    topic = Topic(
-        title=title,
-        normalized_title=title.lower().replace(" ", "_"),
-        description=description,
-        category=category,
-        trend_score=topic_data.get("trend_score", 0.0),
-        tags=topic_data.get("tags", []),
+    # INSERT ... RETURNING hands back the row with its generated id and
+    # timestamps, so no refresh SELECT is needed. title and normalized_title
+    # carry unique indexes; let the INSERT decide instead of a racy
+    # SELECT-then-INSERT.
+    stmt = (
+        insert(Topic)
+        .values(
+            title=title,
+            normalized_title=normalize_topic_title(title),
+            description=description,
+            category=category,
+            trend_score=topic_data.get("trend_score", 0.0),
+            tags=topic_data.get("tags", []),
+        )
+        .returning(Topic)
     )
-
-    db.add(topic)
-    await db.commit()
-    await db.refresh(topic)
+    try:
+        topic = (await db.execute(stmt)).scalar_one()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Topic already exists")
+    await response_cache.clear(TOPICS_CACHE_PREFIX)
 
     return topic
 
@@ -64,7 +129,17 @@ async def create_topic(topic_data: dict, db: AsyncSession = Depends(get_db)):
 async def get_topic_content(topic_id: int, db: AsyncSession = Depends(get_db)):
     """Get content for a specific topic"""
     result = await db.execute(
-        select(ContentItem).where(ContentItem.topic_id == topic_id)
+        select(ContentItem)
+        .where(ContentItem.topic_id == topic_id)
+        .options(defer(ContentItem.image_data))
     )
     content_items = result.scalars().all()
+
+    # Only an empty result needs the topic probe, to tell "unknown topic"
+    # apart from "topic without content"; the common case is one query.
+    if not content_items:
+        topic_exists = await db.scalar(select(exists().where(Topic.id == topic_id)))
+        if not topic_exists:
+            raise HTTPException(status_code=404, detail="Topic not found")
+
     return content_items
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas import UserCreate
-from app.services.user_service import create_user, get_user_by_email
+from app.services.user_service import create_user, email_exists
 from app.services.email_service import email_service
 from app.api.v1.deps import get_db
 from app.core.input_validation import InputValidator
@@ -21,8 +21,7 @@ async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     user.username = InputValidator.validate_xss_safe(user.username)
     
     # Check if user already exists
-    existing = await get_user_by_email(db, user.email)
-    if existing:
+    if await email_exists(db, user.email):
         raise HTTPException(status_code=400, detail="Email already registered")
     db_user = await create_user(db, user)
     # Send registration email
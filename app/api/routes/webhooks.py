@@ -99,7 +99,7 @@ async def brevo_webhook(request: Request, background_tasks: BackgroundTasks) ->
 
 async def _store_brevo_events(events):
     """Store email events in database asynchronously."""
-    from app.database import AsyncSessionLocal
+    from app.db import AsyncSessionLocal
     
     async with AsyncSessionLocal() as db:
         try:
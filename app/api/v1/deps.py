@@ -7,7 +7,7 @@ This module contains shared dependencies used across API routes, including:
 - Permission checking
 """
 
-from typing import Annotated, AsyncGenerator, Optional
+from typing import Annotated, AsyncGenerator, Dict, Optional
 from fastapi import (
     Depends,
     HTTPException,
@@ -15,27 +15,85 @@ from fastapi import (
     Request,
     Response,
 )  # pyright: ignore[reportMissingImports]
-from fastapi.security import (
-    OAuth2PasswordBearer,
-)  # pyright: ignore[reportMissingImports]
-from sqlalchemy.ext.asyncio import AsyncSession  # pyright: ignore[reportMissingImports]
+from sqlalchemy.ext.asyncio import (  # pyright: ignore[reportMissingImports]
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+)
 from sqlalchemy import select  # pyright: ignore[reportMissingImports]
-import uuid
+import secrets
 
-from app.db import AsyncSessionLocal
+from app.db import AsyncSessionLocal, engine
 from app.models import User
 from app.models.user import UserSession
-from app.core.auth import verify_token
+from app.core.auth import decode_token, verify_token
+from app.middleware.auth_middleware import parse_cookie_fast
 from app.services.user_service import get_user_by_username
 
-# OAuth2 scheme for token authentication
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+def request_cookies(request: Request) -> Dict[str, str]:
+    """
+    Return the auth cookies (``access_token``, ``nexus_session``) of a request.
+
+    Parsed once per request: AuthASGIMiddleware normally fills
+    ``request.state.cookies``; otherwise the Cookie header is scanned here
+    and the result cached on ``request.state``.
+
+    Args:
+        request: HTTP request
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    Returns:
+        Dict[str, str]: Cookie name to value, for the auth cookies present
+    """
+    cookies = getattr(request.state, "cookies", None)
+    if cookies is None:
+        header = request.headers.get("cookie")
+        cookies = parse_cookie_fast(header.encode("latin-1")) if header else {}
+        request.state.cookies = cookies
+    return cookies
+
+
+async def bearer_token(request: Request) -> str:
+    """
+    Dependency returning the bearer token of the current request.
+
+    Async so FastAPI awaits it on the event loop instead of dispatching a sync
+    security scheme to the threadpool. Uses the token already extracted by
+    AuthASGIMiddleware when available.
+
+    Args:
+        request: HTTP request
+
+    Returns:
+        str: Raw JWT (without the ``Bearer `` prefix)
+
+    Raises:
+        HTTPException: 401 if no bearer token was sent
+    """
+    token = getattr(request.state, "auth_token", None)
+    if token is None:
+        auth_header = request.headers.get("authorization", "")
+        if auth_header.startswith("Bearer "):
+            token = auth_header[7:]
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for database session management.
 
+    Uses the session factory registered on ``app.state`` at startup. The
+    session only checks out a pooled connection when it first executes.
+
+    Args:
+        request: HTTP request (for access to ``app.state``)
+
     Yields:
         AsyncSession: Database session
 
@@ -46,19 +104,59 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             ...
         ```
     """
-    async with AsyncSessionLocal() as session:
+    async with get_session_factory(request)() as session:
         yield session
 
 
+def get_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    """
+    Return the session factory registered on ``app.state``.
+
+    Use it to open extra sessions for work that runs concurrently with the
+    request's own session (AsyncSession is not safe for concurrent use).
+
+    Args:
+        request: HTTP request (for access to ``app.state``)
+
+    Returns:
+        async_sessionmaker: Session factory
+    """
+    return getattr(request.app.state, "session_factory", AsyncSessionLocal)
+
+
+async def get_ro_conn(request: Request) -> AsyncGenerator[AsyncConnection, None]:
+    """
+    Dependency for read-only Core queries.
+
+    Yields a plain ``AsyncConnection`` (no ORM session or identity map) for
+    endpoints that only read columns.
+
+    Args:
+        request: HTTP request (for access to ``app.state``)
+
+    Yields:
+        AsyncConnection: Database connection
+    """
+    db_engine = getattr(request.app.state, "engine", engine)
+    async with db_engine.connect() as conn:
+        yield conn
+
+
 async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
+    request: Request,
+    token: Annotated[str, Depends(bearer_token)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> User:
     """
     Dependency to get the current authenticated user.
 
+    The bearer token is extracted and verified once by AuthASGIMiddleware and
+    read from ``request.state``; the token is decoded here only when the
+    middleware is not installed.
+
     Args:
-        token: JWT token from request
+        request: HTTP request
+        token: Bearer token from bearer_token
         db: Database session
 
     Returns:
@@ -80,7 +178,13 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    username = verify_token(token)
+    state = request.state
+    if hasattr(state, "auth_token"):
+        claims = state.auth_claims
+    else:
+        claims = decode_token(token)
+
+    username = claims.get("sub") if claims else None
     if username is None:
         raise credentials_exception
 
@@ -91,6 +195,22 @@ async def get_current_user(
     return user
 
 
+def optional_username(request: Request) -> Optional[str]:
+    """
+    Username from a valid bearer token, or None. Never raises and never
+    touches the database (claims come from AuthASGIMiddleware when installed).
+    """
+    state = request.state
+    if hasattr(state, "auth_token"):
+        claims = state.auth_claims
+        return claims.get("sub") if claims else None
+
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return None
+    return verify_token(auth_header[7:])  # Remove "Bearer " prefix
+
+
 async def get_current_user_optional(
     request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -118,14 +238,7 @@ async def get_current_user_optional(
         ```
     """
     try:
-        # Try to get token from Authorization header
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return None
-
-        token = auth_header[7:]  # Remove "Bearer " prefix
-        username = verify_token(token)
-
+        username = optional_username(request)
         if username is None:
             return None
 
@@ -192,7 +305,7 @@ async def get_or_create_session(
     from datetime import datetime, timedelta
 
     # Try to get session token from cookie
-    session_token = request.cookies.get("nexus_session")
+    session_token = request_cookies(request).get("nexus_session")
 
     # Try to find existing session in database
     if session_token:
@@ -207,7 +320,7 @@ async def get_or_create_session(
             return session
 
     # Create new session for anonymous user
-    session_token = str(uuid.uuid4())
+    session_token = secrets.token_urlsafe(16)
     new_session = UserSession(
         session_token=session_token,
         user_id=None,  # Anonymous
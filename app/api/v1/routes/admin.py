@@ -10,30 +10,70 @@ Secure admin-only endpoints for:
 Security: All endpoints require admin authentication
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Optional, Dict, List, Any
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import ORJSONResponse
+from typing import Optional, Dict, List, Any, NamedTuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 import asyncio
+import os
 from app.core.input_validation import InputValidator
 
-from app.api.v1.deps import get_db, get_current_user
+from app.api.v1.deps import bearer_token, get_db, get_current_user
 from app.models import User, UserInteraction, ContentItem, UserSession
-from app.core.config import settings
+from app.core.auth import decode_token
+from app.core.cache import HOVER_SETTINGS_CACHE_PREFIX, response_cache
+from app.services.user_service import get_user_by_username
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
-async def read_file_async(path):
-    """Read file asynchronously using thread pool"""
+# Bytes read from the end of a log file when tailing it. Large enough for the
+# line counts the dashboard asks for without reading multi-MB logs in full.
+LOG_TAIL_WINDOW = 64 * 1024
 
-    def _read():
-        with open(path) as f:
-            return f.read()
 
-    return await asyncio.to_thread(_read)
+async def read_file_tail_async(path, window: int = LOG_TAIL_WINDOW) -> bytes:
+    """Read the last ``window`` bytes of a file in a single thread pool hop.
+
+    Opens, seeks and reads inside one worker call so a tail costs one executor
+    dispatch regardless of file size. A partial first line is dropped when the
+    read did not start at the beginning of the file.
+    """
+
+    def _read_tail():
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            start = max(0, f.tell() - window)
+            f.seek(start)
+            data = f.read()
+        if start > 0:
+            newline = data.find(b"\n")
+            data = data[newline + 1 :] if newline >= 0 else b""
+        return data
+
+    return await asyncio.to_thread(_read_tail)
+
+
+def last_n_lines(data: bytes, n: int) -> bytes:
+    """Return the last ``n`` lines of ``data`` by scanning back for newlines.
+
+    Only the returned slice is copied; no per-line list is built. A trailing
+    newline does not count as an extra (empty) line.
+    """
+    pos = len(data)
+    for _ in range(n):
+        if pos <= 1:
+            pos = 0
+            break
+        i = data.rfind(b"\n", 0, pos - 1)
+        if i < 0:
+            pos = 0
+            break
+        pos = i + 1
+    return data[pos:]
 
 
 # Pydantic Models
@@ -53,12 +93,49 @@ class UserCustomSettings(BaseModel):
     custom_settings: Optional[Dict[str, Any]] = None
 
 
+class AdminPrincipal(NamedTuple):
+    """Admin identity taken from verified token claims (no DB row loaded)"""
+
+    username: str
+    is_admin: bool = True
+
+
 # Admin verification dependency
-def verify_admin(current_user: User = Depends(get_current_user)):
-    """Verify that the current user is an admin"""
+async def verify_admin(
+    request: Request,
+    token: str = Depends(bearer_token),
+    db: AsyncSession = Depends(get_db),
+) -> AdminPrincipal:
+    """
+    Verify that the current user is an admin.
+
+    Tokens are signed and carry an ``is_admin`` claim set at login, so a valid
+    token claiming admin is trusted without a user lookup; the dashboard polls
+    these endpoints continuously. Tokens without the claim fall back to the DB.
+    A revoked admin flag takes effect when the (30 minute) token expires.
+
+    Both paths return an ``AdminPrincipal``; dependents only get the admin's
+    username, never a loaded ``User`` row.
+    """
+    if hasattr(request.state, "auth_token"):
+        # Already extracted and verified by AuthASGIMiddleware
+        claims = request.state.auth_claims
+    else:
+        claims = decode_token(token)
+    if claims is None or claims.get("sub") is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if claims.get("is_admin") is True:
+        return AdminPrincipal(username=claims["sub"])
+
+    current_user = await get_user_by_username(db, username=claims["sub"])
     if not current_user or not current_user.is_admin:  # type: ignore
         raise HTTPException(status_code=403, detail="Admin access required")
-    return current_user
+    return AdminPrincipal(username=current_user.username)
 
 
 @router.get("/verify")
@@ -82,7 +159,7 @@ async def verify_admin_access(
 @router.get("/tracking-log")
 async def get_tracking_log(
     limit: int = Query(100, ge=1, le=1000),
-    admin: User = Depends(verify_admin),
+    admin: AdminPrincipal = Depends(verify_admin),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """Get recent interest tracking events"""
@@ -121,7 +198,7 @@ async def get_tracking_log(
 
 @router.post("/clear-tracking")
 async def clear_tracking_log(
-    admin: User = Depends(verify_admin), db: AsyncSession = Depends(get_db)
+    admin: AdminPrincipal = Depends(verify_admin), db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """Clear all interest tracking data (destructive operation)"""
 
@@ -144,7 +221,9 @@ async def clear_tracking_log(
 
 
 @router.get("/settings/global")
-async def get_global_settings(admin: User = Depends(verify_admin)) -> Dict[str, Any]:
+async def get_global_settings(
+    admin: AdminPrincipal = Depends(verify_admin),
+) -> Dict[str, Any]:
     """Get current global hover tracking settings"""
 
     # For now, return defaults. In production, these would be stored in database
@@ -163,7 +242,7 @@ async def get_global_settings(admin: User = Depends(verify_admin)) -> Dict[str,
 @router.post("/settings/global")
 async def save_global_settings(
     settings: GlobalSettings,
-    admin: User = Depends(verify_admin),
+    admin: AdminPrincipal = Depends(verify_admin),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, str]:
     """Save global hover tracking settings"""
@@ -175,7 +254,7 @@ async def save_global_settings(
 
 @router.get("/users")
 async def get_all_users(
-    admin: User = Depends(verify_admin), db: AsyncSession = Depends(get_db)
+    admin: AdminPrincipal = Depends(verify_admin), db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """Get all users with interaction counts"""
 
@@ -213,7 +292,7 @@ async def get_all_users(
 @router.get("/users/{user_id}")
 async def get_user_details(
     user_id: int,
-    admin: User = Depends(verify_admin),
+    admin: AdminPrincipal = Depends(verify_admin),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """Get detailed information about a specific user"""
@@ -271,7 +350,7 @@ async def get_user_details(
 async def save_user_settings(
     user_id: int,
     settings: UserCustomSettings,
-    admin: User = Depends(verify_admin),
+    admin: AdminPrincipal = Depends(verify_admin),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, str]:
     """Save custom settings for a specific user"""
@@ -287,6 +366,7 @@ async def save_user_settings(
     user.debug_mode = settings.debug_mode  # type: ignore
 
     await db.commit()
+    await response_cache.delete(HOVER_SETTINGS_CACHE_PREFIX + user.username)
 
     return {"status": "saved", "message": f"Settings updated for user {user_id}"}
 
@@ -295,7 +375,7 @@ async def save_user_settings(
 async def get_analytics(
     start: str = Query(..., description="Start date (YYYY-MM-DD)"),
     end: str = Query(..., description="End date (YYYY-MM-DD)"),
-    admin: User = Depends(verify_admin),
+    admin: AdminPrincipal = Depends(verify_admin),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """Get analytics data for specified date range"""
@@ -419,7 +499,7 @@ AVAILABLE_SCRIPTS = {
 
 
 @router.get("/dashboard", response_class=HTMLResponse)
-async def admin_dashboard(current_user: User = Depends(verify_admin)):
+async def admin_dashboard(current_user: AdminPrincipal = Depends(verify_admin)):
     """Admin dashboard with storage, scripts, terminal, and chat"""
     # Read system logs
     error_log = ""
@@ -427,20 +507,22 @@ async def admin_dashboard(current_user: User = Depends(verify_admin)):
     try:
         error_log_path = PROJECT_ROOT / "logs" / "error.log"
         if error_log_path.exists():
-            error_log = await read_file_async(str(error_log_path))
+            data = await read_file_tail_async(str(error_log_path))
             # Show last 50 lines
-            error_log_lines = error_log.split("\n")[-50:]
-            error_log = "\n".join(error_log_lines).strip()
+            error_log = (
+                last_n_lines(data, 50).decode("utf-8", errors="replace").strip()
+            )
     except Exception:
         error_log = "Error reading error.log"
 
     try:
         service_log_path = PROJECT_ROOT / "logs" / "service.log"
         if service_log_path.exists():
-            service_log = await read_file_async(str(service_log_path))
+            data = await read_file_tail_async(str(service_log_path))
             # Show last 30 lines
-            service_log_lines = service_log.split("\n")[-30:]
-            service_log = "\n".join(service_log_lines).strip()
+            service_log = (
+                last_n_lines(data, 30).decode("utf-8", errors="replace").strip()
+            )
     except Exception:
         service_log = "Error reading service.log"
 
@@ -717,30 +799,30 @@ async def admin_dashboard(current_user: User = Depends(verify_admin)):
 
 
 @router.get("/logs/error")
-async def get_error_log(current_user: User = Depends(verify_admin)):
+async def get_error_log(current_user: AdminPrincipal = Depends(verify_admin)):
     """Get the last 50 lines of error.log"""
     try:
         error_log_path = PROJECT_ROOT / "logs" / "error.log"
         if error_log_path.exists():
-            content = await read_file_async(str(error_log_path))
+            data = await read_file_tail_async(str(error_log_path))
             # Return last 50 lines
-            lines = content.split("\n")[-50:]
-            return {"content": "\n".join(lines).strip()}
+            tail = last_n_lines(data, 50)
+            return {"content": tail.decode("utf-8", errors="replace").strip()}
         return {"content": "error.log not found"}
     except Exception as e:
         return {"content": f"Error reading error.log: {str(e)}"}
 
 
 @router.get("/logs/service")
-async def get_service_log(current_user: User = Depends(verify_admin)):
+async def get_service_log(current_user: AdminPrincipal = Depends(verify_admin)):
     """Get the last 30 lines of service.log"""
     try:
         service_log_path = PROJECT_ROOT / "logs" / "service.log"
         if service_log_path.exists():
-            content = await read_file_async(str(service_log_path))
+            data = await read_file_tail_async(str(service_log_path))
             # Return last 30 lines
-            lines = content.split("\n")[-30:]
-            return {"content": "\n".join(lines).strip()}
+            tail = last_n_lines(data, 30)
+            return {"content": tail.decode("utf-8", errors="replace").strip()}
         return {"content": "service.log not found"}
     except Exception as e:
         return {"content": f"Error reading service.log: {str(e)}"}
@@ -748,7 +830,7 @@ async def get_service_log(current_user: User = Depends(verify_admin)):
 
 @router.post("/run-script")
 async def run_script_endpoint(
-    request: Dict[str, str], current_user: User = Depends(verify_admin)
+    request: Dict[str, str], current_user: AdminPrincipal = Depends(verify_admin)
 ):
     """Run a predefined server script"""
     script_name = request.get("name")
@@ -776,7 +858,7 @@ async def run_script_endpoint(
 
 @router.post("/terminal")
 async def terminal_endpoint(
-    request: Dict[str, str], current_user: User = Depends(verify_admin)
+    request: Dict[str, str], current_user: AdminPrincipal = Depends(verify_admin)
 ):
     """Execute arbitrary terminal command (admin only)"""
     cmd = request.get("cmd", "").strip()
@@ -807,7 +889,7 @@ async def terminal_endpoint(
 
 @router.post("/chat")
 async def chat_endpoint(
-    request: Dict[str, str], current_user: User = Depends(verify_admin)
+    request: Dict[str, str], current_user: AdminPrincipal = Depends(verify_admin)
 ):
     """Chat with Copilot (placeholder - would integrate with actual Copilot API)"""
     message = request.get("message", "")
@@ -828,10 +910,8 @@ async def chat_endpoint(
 
 
 @router.get("/logs/list")
-async def list_logs(admin: User = Depends(verify_admin)) -> Dict[str, Any]:
+async def list_logs(admin: AdminPrincipal = Depends(verify_admin)) -> Dict[str, Any]:
     """List all available log files in the logs directory"""
-    import os
-
     log_dir = os.path.join(os.getcwd(), "logs")
     
     if not os.path.exists(log_dir):
@@ -864,11 +944,9 @@ async def list_logs(admin: User = Depends(verify_admin)) -> Dict[str, Any]:
 async def get_logs(
     log_type: str,
     lines: int = Query(100, ge=10, le=1000),
-    admin: User = Depends(verify_admin),
+    admin: AdminPrincipal = Depends(verify_admin),
 ) -> Dict[str, Any]:
     """Get server logs (any .log file in the logs directory)"""
-    import os
-
     log_dir = os.path.join(os.getcwd(), "logs")
     
     # Construct the filename - if log_type doesn't end with .log, add it
@@ -887,13 +965,13 @@ async def get_logs(
             safe_log_type = InputValidator.sanitize_for_logging(log_type, max_length=50)
             return {"content": f"Log file not found: {safe_log_type}.log"}
         
-        # Read last N lines efficiently
-        content = await read_file_async(log_file)
-        all_lines = content.split('\n')
-        last_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-        content = '\n'.join(last_lines)
+        # Read last N lines efficiently (assume ~512 bytes per line at most)
+        data = await read_file_tail_async(log_file, max(LOG_TAIL_WINDOW, lines * 512))
+        tail = last_n_lines(data, lines)
+        content = tail.decode("utf-8", errors="replace")
+        line_count = tail.count(b"\n") + (0 if tail.endswith(b"\n") else 1) if tail else 0
         
-        return {"content": content, "lines": len(last_lines)}
+        return {"content": content, "lines": line_count}
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading log file: {str(e)}")
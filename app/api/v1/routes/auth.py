@@ -1,27 +1,54 @@
-from fastapi import APIRouter, Response, Depends, HTTPException, status, Request, Cookie
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Response,
+    Depends,
+    HTTPException,
+    status,
+    Request,
+)
 from typing import Annotated, Optional
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import timedelta
+from fastapi.responses import ORJSONResponse
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from datetime import datetime, timedelta, timezone
+from pydantic import BaseModel
+from string import Template
+import asyncio
+import hashlib
+import logging
+import orjson
+import secrets
 import sys
 from app.core.input_validation import InputValidator
 
-from app.api.v1.deps import get_db
+from app.api.v1.deps import (
+    get_db,
+    get_ro_conn,
+    get_current_user,
+    get_session_factory,
+    request_cookies,
+)
 from app.schemas import Token, UserCreate, UserResponse, UserLogin, RegisterResponse
 from app.services.user_service import (
     create_user,
     authenticate_user,
     get_user_by_username,
-    get_user_by_email,
+    get_user_by_username_or_email,
 )
 from app.services.session_service import migrate_session_to_user
 from app.services.email_service import email_service
-from app.core.auth import create_access_token, verify_token
+from app.core.auth import create_access_token, get_password_hash, verify_token
 from app.core.config import settings
+from app.middleware.auth_middleware import strip_bearer
 from app.models import User
+from app.models.user import BrevoEmailEvent
+
+logger = logging.getLogger(__name__)
 
 # Router Configuration
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.get("/debug")
@@ -41,12 +68,23 @@ async def logout(response: Response):
     return redirect_response
 
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+# --- Token Refresh Endpoint ---
 
 
-# --- Token Refresh Endpoint ---
-from datetime import timedelta
-from app.schemas import Token
+def _extract_bearer(request: Request) -> Optional[str]:
+    """Token from the access_token cookie, else the Authorization header.
+
+    Uses the values already stripped by AuthASGIMiddleware when available.
+    """
+    state = request.state
+    if hasattr(state, "cookie_token"):
+        return state.cookie_token or state.auth_token
+
+    cookie = request_cookies(request).get("access_token")
+    if cookie:
+        return strip_bearer(cookie)
+    auth_header = request.headers.get("authorization", "")
+    return strip_bearer(auth_header) if auth_header.startswith("Bearer ") else None
 
 
 @router.post(
@@ -60,19 +98,14 @@ from app.schemas import Token
 async def refresh_token(
     request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
-    access_token: Optional[str] = Cookie(default=None),
-) -> Token:
+) -> Response:
     """
     Issue a new JWT if the user has a valid session (access_token cookie).
+
+    The body is encoded directly with orjson; ``response_model`` is kept for
+    the OpenAPI schema only.
     """
-    token = None
-    # Try to get token from cookie or Authorization header
-    if access_token:
-        token = access_token.replace("Bearer ", "")
-    else:
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header[7:]
+    token = _extract_bearer(request)
     if not token:
         raise HTTPException(status_code=401, detail="Missing token")
     username = verify_token(token)
@@ -86,30 +119,11 @@ async def refresh_token(
         data={"sub": user.username, "is_admin": user.is_admin},
         expires_delta=access_token_expires,
     )
-    return Token(access_token=new_token, token_type="bearer")
-
-
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
-    """Dependency to get the current authenticated user."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
+    return Response(
+        content=orjson.dumps({"access_token": new_token, "token_type": "bearer"}),
+        media_type="application/json",
     )
 
-    username = verify_token(token)
-    if username is None:
-        raise credentials_exception
-
-    user = await get_user_by_username(db, username=username)
-    if user is None:
-        raise credentials_exception
-
-    return user
-
 
 @router.post(
     "/register",
@@ -123,8 +137,8 @@ async def get_current_user(
 async def register(
     user_data: UserCreate,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Annotated[AsyncSession, Depends(get_db)],
-    nexus_session: Optional[str] = Cookie(default=None),
 ) -> RegisterResponse:
     """
     Register a new user and migrate any anonymous session data.
@@ -132,8 +146,8 @@ async def register(
     Args:
         user_data: User registration data including username, email, and password
         request: FastAPI request object for session management
+        background_tasks: Used to send the welcome email after responding
         db: Database session dependency
-        nexus_session: Optional session cookie for migration
 
     Returns:
         The created user object
@@ -145,27 +159,44 @@ async def register(
     user_data.username = InputValidator.validate_xss_safe(user_data.username)
     user_data.email = InputValidator.validate_xss_safe(user_data.email)
     
-    # Check if username exists
-    if await get_user_by_username(db, username=user_data.username):
+    # Check if username or email exists (one round-trip, at most two rows)
+    result = await db.execute(
+        select(User.username, User.email).where(
+            or_(User.username == user_data.username, User.email == user_data.email)
+        )
+    )
+    existing = result.all()
+    if any(row.username == user_data.username for row in existing):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered",
         )
-
-    # Check if email exists
-    if await get_user_by_email(db, email=user_data.email):
+    if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
     user = await create_user(db, user_data)
 
-    # Migrate anonymous session data if session token exists
-    await _migrate_anonymous_session(db, request, nexus_session, user.id)  # type: ignore
+    # Session migration and the Brevo check are independent; run them
+    # concurrently, the check on its own session.
+    session_factory = get_session_factory(request)
 
-    email_status, email_error = await _send_registration_email(
-        db, user_data.email, user.username  # type: ignore
-    )
+    async def _check_email() -> tuple[str, Optional[str]]:
+        async with session_factory() as check_db:
+            return await _check_registration_email(check_db, user_data.email)
+
+    async with asyncio.TaskGroup() as tg:
+        # Migrate anonymous session data if session token exists
+        tg.create_task(_migrate_anonymous_session(db, request, user.id))  # type: ignore
+        email_check = tg.create_task(_check_email())
+
+    email_status, email_error = email_check.result()
+    if email_status == "pending":
+        # Deliver after the response is sent; Brevo round-trips are slow
+        background_tasks.add_task(
+            _deliver_registration_email, user_data.email, user.username  # type: ignore
+        )
 
     access_token_expires = timedelta(minutes=30)
     access_token = create_access_token(
@@ -173,7 +204,7 @@ async def register(
         expires_delta=access_token_expires,
     )
 
-    if email_status != "ok" and not settings.debug:
+    if email_status == "error" and not settings.debug:
         # Redact details in production
         email_error = "Email delivery encountered a problem."
 
@@ -187,49 +218,57 @@ async def register(
 
 
 async def _migrate_anonymous_session(
-    db: AsyncSession, request: Request, nexus_session: Optional[str], user_id: int
+    db: AsyncSession, request: Request, user_id: int
 ) -> None:
     """Migrate anonymous session data to new user account"""
-    session_token = nexus_session or request.cookies.get("nexus_session")
+    session_token = request_cookies(request).get("nexus_session")
     if not session_token:
         return
 
     try:
         migrated_count = await migrate_session_to_user(db, session_token, user_id)
         if migrated_count > 0:
-            print(
-                f"Migrated {migrated_count} interactions from anonymous session to user {user_id}"
+            logger.info(
+                "Migrated %d interactions from anonymous session to user %s",
+                migrated_count,
+                user_id,
             )
     except Exception as e:
-        print(f"Failed to migrate session data: {str(e)}")
+        logger.warning("Failed to migrate session data: %s", e)
 
 
-async def _send_registration_email(
-    db: AsyncSession, email: str, username: str
+async def _check_registration_email(
+    db: AsyncSession, email: str
 ) -> tuple[str, Optional[str]]:
-    """Send registration email and check for Brevo email issues"""
-    from sqlalchemy import select
-    from app.models.user import BrevoEmailEvent
-
-    stmt = (
-        select(BrevoEmailEvent)
-        .where(BrevoEmailEvent.email == email)
-        .order_by(BrevoEmailEvent.received_at.desc())
-        .limit(1)
-    )
+    """Check for Brevo email issues before queueing the registration email"""
+    # Only existence matters here; no ordering or row fetch needed
+    stmt = select(literal(1)).where(BrevoEmailEvent.email == email).limit(1)
     brevo_result = await db.execute(stmt)
-    brevo_event = brevo_result.scalars().first()
 
-    if brevo_event:
+    if brevo_result.scalar() is not None:
         return "error", "Email not working. Try a different one."
 
+    return "pending", None
+
+
+async def _deliver_registration_email(email: str, username: str) -> None:
+    """Background task: send the welcome email"""
     try:
         success = await email_service.send_registration_email_async(email, username)
         if not success:
-            return "error", "Registration email failed to send."
-        return "ok", None
+            logger.warning("Registration email failed to send")
+    except Exception as e:
+        logger.error("Failed to send registration email: %s", e)
+
+
+def _send_email_quietly(recipient: str, subject: str, body_html: str) -> None:
+    """Background task: send an email, never raising into the task runner"""
+    try:
+        email_service.send_email(
+            recipient=recipient, subject=subject, body_html=body_html
+        )
     except Exception as e:
-        return "error", str(e)
+        logger.error("Failed to send email: %s", e)
 
 
 @router.post(
@@ -245,7 +284,6 @@ async def login(
     request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Annotated[AsyncSession, Depends(get_db)],
-    nexus_session: Optional[str] = Cookie(default=None),
 ) -> Token:
     """
     Authenticate a user, return an access token, and migrate any anonymous session data.
@@ -255,7 +293,6 @@ async def login(
         request: FastAPI request object for session management
         form_data: OAuth2 form containing username and password
         db: Database session dependency
-        nexus_session: Optional session cookie for migration
 
     Returns:
         Token object containing the access token
@@ -272,17 +309,19 @@ async def login(
         )
 
     # Migrate anonymous session data if session token exists
-    session_token = nexus_session or request.cookies.get("nexus_session")
+    session_token = request_cookies(request).get("nexus_session")
     if session_token:
         try:
             migrated_count = await migrate_session_to_user(db, session_token, user.id)  # type: ignore
             if migrated_count > 0:
-                print(
-                    f"Migrated {migrated_count} interactions from anonymous session to user {user.id}"
+                logger.info(
+                    "Migrated %d interactions from anonymous session to user %s",
+                    migrated_count,
+                    user.id,
                 )
         except Exception as e:
             # Log the error but don't fail login
-            print(f"Failed to migrate session data during login: {str(e)}")
+            logger.warning("Failed to migrate session data during login: %s", e)
 
     access_token_expires = timedelta(minutes=30)
     access_token = create_access_token(
@@ -327,37 +366,56 @@ async def read_users_me(
 
 
 @router.get("/check-email-status")
-async def check_email_status(email: str, db: AsyncSession = Depends(get_db)):
+async def check_email_status(
+    email: str, conn: AsyncConnection = Depends(get_ro_conn)
+):
     """Check if an email has failed Brevo validation."""
-    from sqlalchemy import select
-    from app.models.user import BrevoEmailEvent
-
-    # Check for any failed email events
-    stmt = (
-        select(BrevoEmailEvent)
+    # Latest event type, served from the (email, received_at) index
+    event_type = await conn.scalar(
+        select(BrevoEmailEvent.event_type)
         .where(BrevoEmailEvent.email == email)
         .order_by(BrevoEmailEvent.received_at.desc())
         .limit(1)
     )
 
-    result = await db.execute(stmt)
-    event = result.scalars().first()
-
-    if event:
+    if event_type is not None:
         return {
             "has_error": True,
             "message": "Email not working. Try a different one.",
-            "event_type": event.event_type,
+            "event_type": event_type,
         }
 
     return {"has_error": False, "message": None, "event_type": None}
 
 
 # === Password Reset Flow ===
-import secrets
-from datetime import datetime, timedelta, timezone
-import asyncio
-from pydantic import BaseModel
+
+# Email bodies are built once at import; only the reset URL varies
+_RESET_EMAIL_SUBJECT = "Nexus - Reset Your Password"
+_RESET_EMAIL_TEMPLATE = Template(
+    """
+    <h2>Password Reset Request</h2>
+    <p>Click the link below to reset your password. This link expires in 1 hour.</p>
+    <a href="${reset_url}" style="background: #0078d7; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px; display: inline-block;">
+        Reset Password
+    </a>
+    <p>Or copy this link: ${reset_url}</p>
+    <p>If you didn't request this, you can safely ignore this email.</p>
+    """
+)
+
+_RESET_CONFIRMATION_SUBJECT = "Nexus - Password Reset Successful"
+_RESET_CONFIRMATION_HTML = """
+    <h2>Password Changed</h2>
+    <p>Your password has been successfully reset.</p>
+    <p>You can now log in with your new password.</p>
+    <p>If you didn't make this change, please contact support immediately.</p>
+    """
+
+
+def _hash_reset_token(token: str) -> str:
+    """Reset tokens are stored and looked up by their SHA-256 digest"""
+    return hashlib.sha256(token.encode()).hexdigest()
 
 
 class ForgotPasswordRequest(BaseModel):
@@ -371,7 +429,9 @@ class ResetPasswordRequest(BaseModel):
 
 @router.post("/forgot-password")
 async def forgot_password(
-    request: ForgotPasswordRequest, db: AsyncSession = Depends(get_db)
+    request: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
 ):
     """Send password reset email to user"""
     username_or_email = InputValidator.validate_xss_safe(request.username_or_email.strip())
@@ -380,9 +440,7 @@ async def forgot_password(
         raise HTTPException(status_code=400, detail="Username or email required")
 
     # Find user by username or email
-    user = await get_user_by_username(db, username_or_email) or await get_user_by_email(
-        db, username_or_email
-    )
+    user = await get_user_by_username_or_email(db, username_or_email)
 
     if not user or not user.email:  # type: ignore
         # Return generic message for security (don't reveal if account exists)
@@ -392,35 +450,24 @@ async def forgot_password(
     reset_token = secrets.token_urlsafe(32)
     reset_expires = datetime.now(timezone.utc) + timedelta(hours=1)
 
-    # Store reset token in user record
-    user.password_reset_token = reset_token  # type: ignore
-    user.password_reset_expires = reset_expires  # type: ignore
-    db.add(user)
+    # Store reset token in user record (single UPDATE by primary key)
+    await db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(
+            password_reset_token_hash=_hash_reset_token(reset_token),
+            password_reset_expires=reset_expires,
+        )
+    )
     await db.commit()
 
     # Send reset email
     reset_url = f"{settings.FRONTEND_URL}/reset-password?token={reset_token}"
-    subject = "Nexus - Reset Your Password"
-    html_content = f"""
-    <h2>Password Reset Request</h2>
-    <p>Click the link below to reset your password. This link expires in 1 hour.</p>
-    <a href="{reset_url}" style="background: #0078d7; color: white; padding: 10px 20px; text-decoration: none; border-radius: 4px; display: inline-block;">
-        Reset Password
-    </a>
-    <p>Or copy this link: {reset_url}</p>
-    <p>If you didn't request this, you can safely ignore this email.</p>
-    """
+    subject = _RESET_EMAIL_SUBJECT
+    html_content = _RESET_EMAIL_TEMPLATE.substitute(reset_url=reset_url)
 
-    try:
-        await asyncio.to_thread(
-            email_service.send_email,
-            recipient=user.email,  # type: ignore
-            subject=subject,
-            body_html=html_content,
-        )
-    except Exception:
-        # Still return success message for security
-        pass
+    # Sent after the response; the reply is the same whether or not it succeeds
+    background_tasks.add_task(_send_email_quietly, user.email, subject, html_content)
 
     return {"detail": "If account exists, reset link sent to email"}
 
@@ -441,45 +488,52 @@ async def reset_password(
             status_code=400, detail="Password must be at least 8 characters"
         )
 
-    # Find user with matching reset token
-    from sqlalchemy import select
+    # Validate the token before paying for a bcrypt hash
+    token_hash = _hash_reset_token(token)
+    user_id = await db.scalar(
+        select(User.id).where(
+            User.password_reset_token_hash == token_hash,
+            User.password_reset_expires > datetime.now(timezone.utc),
+        )
+    )
+    if user_id is None:
+        raise HTTPException(status_code=400, detail="Invalid or expired reset token")
+
+    # bcrypt is CPU-bound; hash off the event loop
+    hashed_password = await asyncio.to_thread(get_password_hash, new_password)
 
-    stmt = select(User).where(
-        User.password_reset_token == token,
-        User.password_reset_expires > datetime.now(timezone.utc),
+    # Still keyed on the token hash so a concurrent reset can't use it twice
+    stmt = (
+        update(User)
+        .where(User.id == user_id, User.password_reset_token_hash == token_hash)
+        .values(
+            hashed_password=hashed_password,
+            password_reset_token_hash=None,
+            password_reset_expires=None,
+        )
+        .returning(User.email)
     )
     result = await db.execute(stmt)
-    user = result.scalars().first()
+    user_email = result.scalar()
 
-    if not user:
+    if user_email is None:
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
 
-    # Update password
-    from app.core.auth import get_password_hash
-
-    user.hashed_password = get_password_hash(new_password)  # type: ignore
-    user.password_reset_token = None  # type: ignore
-    user.password_reset_expires = None  # type: ignore
-    db.add(user)
     await db.commit()
 
     # Send confirmation email
-    subject = "Nexus - Password Reset Successful"
-    html_content = """
-    <h2>Password Changed</h2>
-    <p>Your password has been successfully reset.</p>
-    <p>You can now log in with your new password.</p>
-    <p>If you didn't make this change, please contact support immediately.</p>
-    """
+    subject = _RESET_CONFIRMATION_SUBJECT
+    html_content = _RESET_CONFIRMATION_HTML
 
     try:
         await asyncio.to_thread(
             email_service.send_email,
-            recipient=user.email,  # type: ignore
+            recipient=user_email,
             subject=subject,
             body_html=html_content,
         )
     except Exception as e:
-        print(f"Failed to send confirmation email: {e}")
+        logger.error("Failed to send confirmation email: %s", e)
 
     return {"detail": "Password reset successfully"}
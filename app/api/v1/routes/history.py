@@ -1,18 +1,41 @@
-"""History tracking endpoints."""
+"""History tracking endpoints.
 
+The tracker endpoints are called by every open feed, so each handler does
+its DB work and returns; don't await unrelated I/O (HTTP calls, sleeps)
+while the request's pooled connection is checked out.
+"""
+
+import logging
 from typing import Optional, List
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import select, delete, desc, and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from pydantic import BaseModel, ConfigDict
+import orjson
 
 from app.api.v1.deps import get_db, get_current_session
+from app.core.cache import (
+    HISTORY_COUNT_CACHE_PREFIX,
+    SEEN_IDS_CACHE_PREFIX,
+    response_cache,
+)
 from app.models.user import ContentViewHistory, User
 from app.models.content import ContentItem
 
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+logger = logging.getLogger(__name__)
+
+# /seen-ids is fetched on every feed render; record_view invalidates it
+SEEN_IDS_CACHE_TTL = 60
+# History totals; invalidated by record_view and clear_history
+HISTORY_COUNT_CACHE_TTL = 60
+# Rows removed per DELETE statement in clear_history
+CLEAR_HISTORY_BATCH = 1000
 
 
 class ViewHistoryItem(BaseModel):
@@ -26,8 +49,7 @@ class ViewHistoryItem(BaseModel):
     viewed_at: datetime
     time_spent_seconds: Optional[int]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ViewHistoryResponse(BaseModel):
@@ -49,12 +71,25 @@ class RecordViewRequest(BaseModel):
     time_spent_seconds: Optional[int] = None
 
 
+def _history_count_key(session_token: str, view_type: Optional[str]) -> str:
+    return f"{HISTORY_COUNT_CACHE_PREFIX}{session_token}:{view_type or 'all'}"
+
+
+async def _invalidate_history_counts(session_token: str, view_type: Optional[str]):
+    """Drop cached totals affected by a change to ``view_type`` rows"""
+    if view_type is None:
+        await response_cache.clear(f"{HISTORY_COUNT_CACHE_PREFIX}{session_token}:")
+        return
+    await response_cache.delete(_history_count_key(session_token, view_type))
+    await response_cache.delete(_history_count_key(session_token, None))
+
+
 @router.post("/record", status_code=201)
 async def record_view(
     view_request: RecordViewRequest,
     request: Request,
     response: Response,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     session=Depends(get_current_session),
 ):
     """
@@ -65,24 +100,7 @@ async def record_view(
     - **view_type**: Type of view ('seen', 'clicked', 'read')
     - **time_spent_seconds**: Optional engagement time
     """
-    # Check if already recorded (prevent duplicates for 'seen' type)
-    if view_request.view_type == "seen":
-        from sqlalchemy import select, and_
-
-        stmt = select(ContentViewHistory).where(
-            and_(
-                ContentViewHistory.session_token == session.session_token,
-                ContentViewHistory.content_id == view_request.content_id,
-                ContentViewHistory.view_type == "seen",
-            )
-        )
-        result = await db.execute(stmt)
-        existing = result.scalar_one_or_none()
-        if existing:
-            return {"message": "Already recorded", "id": existing.id}
-
-    # Create history record
-    history = ContentViewHistory(
+    stmt = pg_insert(ContentViewHistory).values(
         user_id=session.user_id,
         session_token=session.session_token,
         content_id=view_request.content_id,
@@ -90,12 +108,28 @@ async def record_view(
         view_type=view_request.view_type,
         time_spent_seconds=view_request.time_spent_seconds,
     )
+    # 'seen' is recorded once per session (partial unique index); a conflict
+    # inserts nothing and returns no row
+    if view_request.view_type == "seen":
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[
+                ContentViewHistory.session_token,
+                ContentViewHistory.content_id,
+            ],
+            index_where=ContentViewHistory.view_type == "seen",
+        )
+
+    result = await db.execute(stmt.returning(ContentViewHistory.id))
+    history_id = result.scalar_one_or_none()
+    await db.commit()
 
-    db.add(history)
-    db.commit()
-    db.refresh(history)
+    if history_id is None:
+        return {"message": "Already recorded"}
 
-    return {"message": "View recorded", "id": history.id}
+    if view_request.view_type == "seen":
+        await response_cache.delete(SEEN_IDS_CACHE_PREFIX + session.session_token)
+    await _invalidate_history_counts(session.session_token, view_request.view_type)
+    return {"message": "View recorded", "id": history_id}
 
 
 @router.get("/viewed", response_model=ViewHistoryResponse)
@@ -107,7 +141,7 @@ async def get_viewed_history(
     ),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     session=Depends(get_current_session),
 ):
     """
@@ -117,50 +151,78 @@ async def get_viewed_history(
     - **page**: Page number (starts at 1)
     - **page_size**: Items per page (default 10, max 100)
     """
-    from sqlalchemy import select, func
-    from sqlalchemy.orm import joinedload
-
-    # Build base select
-    stmt = (
-        select(ContentViewHistory, ContentItem.title)
-        .join(ContentItem, ContentViewHistory.content_id == ContentItem.id)
-        .where(ContentViewHistory.session_token == session.session_token)
-    )
+    # Totals are cached per session and view type. On a miss the total rides
+    # along as a window count so the page and its count come back in one
+    # round trip; on a hit the page query can stop at LIMIT instead of
+    # counting every matching row. Only cached when the cache is shared, so
+    # record_view and clear_history invalidate it on every worker.
+    count_key = _history_count_key(session.session_token, view_type)
+    cached_total = None
+    if response_cache.shared:
+        cached_total = await response_cache.get(count_key)
+    if cached_total is None:
+        stmt = select(ContentViewHistory, func.count().over().label("total"))
+    else:
+        stmt = select(ContentViewHistory)
+
+    stmt = stmt.options(
+        joinedload(ContentViewHistory.content_item, innerjoin=True).load_only(
+            ContentItem.title
+        )
+    ).where(ContentViewHistory.session_token == session.session_token)
 
     if view_type:
         stmt = stmt.where(ContentViewHistory.view_type == view_type)
 
     stmt = stmt.order_by(desc(ContentViewHistory.viewed_at))
 
-    # Get total count (separate query)
-    count_stmt = (
-        select(func.count())
-        .select_from(ContentViewHistory)
-        .where(ContentViewHistory.session_token == session.session_token)
-    )
-    if view_type:
-        count_stmt = count_stmt.where(ContentViewHistory.view_type == view_type)
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar()
-
     # Pagination
     offset = (page - 1) * page_size
     stmt = stmt.offset(offset).limit(page_size)
     result = await db.execute(stmt)
     rows = result.all()
 
+    if cached_total is not None:
+        total = int(cached_total)
+    elif rows:
+        total = rows[0].total
+    elif offset:
+        # Past the last page there is no row to carry the count
+        count_stmt = (
+            select(func.count())
+            .select_from(ContentViewHistory)
+            .join(ContentItem, ContentViewHistory.content_id == ContentItem.id)
+            .where(ContentViewHistory.session_token == session.session_token)
+        )
+        if view_type:
+            count_stmt = count_stmt.where(ContentViewHistory.view_type == view_type)
+        total = await db.scalar(count_stmt)
+    else:
+        total = 0
+
+    if cached_total is None and response_cache.shared:
+        await response_cache.set(
+            count_key, str(total).encode(), HISTORY_COUNT_CACHE_TTL
+        )
+
+    debug = logger.isEnabledFor(logging.DEBUG)
     items = []
-    for history, title in rows:
-        if title is None:
-            print(
-                f"DEBUG: Missing title for history id={history.id}, content_id={history.content_id}, content_slug={history.content_slug}"
+    for row in rows:
+        history = row[0]
+        if debug and history.content_item.title is None:
+            logger.debug(
+                "Missing title for history id=%d content_id=%d slug=%s",
+                history.id,
+                history.content_id,
+                history.content_slug,
             )
+        # Columns are already typed by the DB; skip per-row validation
         items.append(
-            ViewHistoryItem(
+            ViewHistoryItem.model_construct(
                 id=history.id,
                 content_id=history.content_id,
                 content_slug=history.content_slug,
-                title=title if title is not None else "",
+                title=history.content_item.title or "",
                 view_type=history.view_type,
                 viewed_at=history.viewed_at,
                 time_spent_seconds=history.time_spent_seconds,
@@ -169,37 +231,47 @@ async def get_viewed_history(
 
     has_more = (offset + page_size) < total
 
-    return ViewHistoryResponse(
+    # response_model documents the shape; returning the response directly
+    # skips FastAPI's re-validation and jsonable_encoder pass
+    history_page = ViewHistoryResponse.model_construct(
         items=items, total=total, page=page, page_size=page_size, has_more=has_more
     )
+    return ORJSONResponse(history_page.model_dump())
 
 
 @router.get("/seen-ids")
 async def get_seen_content_ids(
     request: Request,
     response: Response,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     session=Depends(get_current_session),
 ):
     """
     Get list of content IDs the user has already seen.
     Used for duplicate prevention in feed.
     """
-    from sqlalchemy import select, and_
-
-    stmt = (
-        select(ContentViewHistory.content_id)
-        .where(
-            and_(
-                ContentViewHistory.session_token == session.session_token,
-                ContentViewHistory.view_type == "seen",
-            )
+    # Only cached when shared: record_view's delete must reach every worker,
+    # or the feed would be sent items this session has already seen
+    cache_key = SEEN_IDS_CACHE_PREFIX + session.session_token
+    if response_cache.shared:
+        cached_body = await response_cache.get(cache_key)
+        if cached_body is not None:
+            return Response(cached_body, media_type="application/json")
+
+    # "seen" rows are unique per (session_token, content_id), so no DISTINCT
+    # (sort + unique) is needed: this is an index-only scan of
+    # ix_content_view_history_seen_unique
+    stmt = select(ContentViewHistory.content_id).where(
+        and_(
+            ContentViewHistory.session_token == session.session_token,
+            ContentViewHistory.view_type == "seen",
         )
-        .distinct()
     )
     result = await db.execute(stmt)
-    seen_ids = result.scalars().all()
-    return {"seen_ids": seen_ids}
+    body = orjson.dumps({"seen_ids": list(result.scalars())})
+    if response_cache.shared:
+        await response_cache.set(cache_key, body, SEEN_IDS_CACHE_TTL)
+    return Response(body, media_type="application/json")
 
 
 @router.delete("/clear")
@@ -209,7 +281,7 @@ async def clear_history(
     view_type: Optional[str] = Query(
         None, description="Clear specific type or all if None"
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     session=Depends(get_current_session),
 ):
     """
@@ -217,14 +289,30 @@ async def clear_history(
 
     - **view_type**: Optional - clear only specific type, or all if not provided
     """
-    from sqlalchemy import delete
-
-    stmt = delete(ContentViewHistory).where(
-        ContentViewHistory.session_token == session.session_token
+    batch_ids = (
+        select(ContentViewHistory.id)
+        .where(ContentViewHistory.session_token == session.session_token)
+        .limit(CLEAR_HISTORY_BATCH)
     )
     if view_type:
-        stmt = stmt.where(ContentViewHistory.view_type == view_type)
-    result = await db.execute(stmt)
-    await db.commit()
-    deleted = result.rowcount
+        batch_ids = batch_ids.where(ContentViewHistory.view_type == view_type)
+    stmt = (
+        delete(ContentViewHistory)
+        .where(ContentViewHistory.id.in_(batch_ids.scalar_subquery()))
+        .execution_options(synchronize_session=False)
+    )
+
+    # Delete in capped batches, committing each one, so a large history never
+    # turns into one long statement holding row locks and a pool connection
+    deleted = 0
+    while True:
+        result = await db.execute(stmt)
+        await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < CLEAR_HISTORY_BATCH:
+            break
+
+    if view_type in (None, "seen"):
+        await response_cache.delete(SEEN_IDS_CACHE_PREFIX + session.session_token)
+    await _invalidate_history_counts(session.session_token, view_type)
     return {"message": f"Cleared {deleted} history items"}
@@ -4,18 +4,65 @@ Settings API endpoint to serve hover tracker configuration to clients
 
 from fastapi import APIRouter, Depends
 from typing import Dict, Any, Optional
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.v1.deps import get_db, get_current_user_optional
+from app.api.v1.deps import get_db, optional_username
+from app.core.cache import HOVER_SETTINGS_CACHE_PREFIX, response_cache
 from app.models import User
 
 router = APIRouter()
 
+# debug_mode only changes through the admin settings endpoint, which
+# invalidates the entry
+HOVER_SETTINGS_CACHE_TTL = 300
+
+# Global defaults. User-specific settings are stored in database via
+# UserSettings model; extended in future for per-user customization
+_BASE_HOVER_SETTINGS = {
+    "minHoverDuration": 1500,
+    "afkThreshold": 5000,
+    "movementThreshold": 5,
+    "microMovementThreshold": 20,
+    "slowdownVelocityThreshold": 0.3,
+    "velocitySampleRate": 100,
+    "interestScoreThreshold": 50,
+    "scrollSlowdownThreshold": 2.0,
+}
+# Only debug_mode varies, so both responses are built once. Visual feedback
+# is only shown in debug mode. Treat these as read-only.
+_HOVER_SETTINGS = {
+    debug: {**_BASE_HOVER_SETTINGS, "showVisualFeedback": debug, "debugMode": debug}
+    for debug in (False, True)
+}
+
+
+async def _get_debug_mode(db: AsyncSession, username: str) -> bool:
+    """User's debug_mode flag, cached per username when the cache is shared."""
+    if not response_cache.shared:
+        # An admin's change would only be dropped on the worker that made it
+        return bool(
+            await db.scalar(select(User.debug_mode).where(User.username == username))
+        )
+
+    cache_key = HOVER_SETTINGS_CACHE_PREFIX + username
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached == b"1"
+
+    debug_mode = bool(
+        await db.scalar(select(User.debug_mode).where(User.username == username))
+    )
+    await response_cache.set(
+        cache_key, b"1" if debug_mode else b"0", HOVER_SETTINGS_CACHE_TTL
+    )
+    return debug_mode
+
 
 @router.get("/hover-tracker")
 async def get_hover_tracker_settings(
     db: AsyncSession = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional),
+    username: Optional[str] = Depends(optional_username),
 ) -> Dict[str, Any]:
     """
     Get hover tracker settings for the current user.
@@ -26,23 +73,7 @@ async def get_hover_tracker_settings(
 
     # Check if user has debug mode enabled (only if authenticated)
     debug_mode = False
-    if current_user:
-        debug_mode = getattr(current_user, "debug_mode", False)
-
-    # User-specific settings are stored in database via UserSettings model
-    # For now, using global defaults. Extended in future for per-user customization
-
-    settings = {
-        "minHoverDuration": 1500,
-        "afkThreshold": 5000,
-        "movementThreshold": 5,
-        "microMovementThreshold": 20,
-        "slowdownVelocityThreshold": 0.3,
-        "velocitySampleRate": 100,
-        "interestScoreThreshold": 50,
-        "scrollSlowdownThreshold": 2.0,
-        "showVisualFeedback": debug_mode,  # Only show visual feedback in debug mode
-        "debugMode": debug_mode,
-    }
-
-    return settings
+    if username:
+        debug_mode = await _get_debug_mode(db, username)
+
+    return _HOVER_SETTINGS[debug_mode]
@@ -7,185 +7,138 @@ Real-time push notifications for:
 """
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Set
-import asyncio
-import json
-from datetime import datetime
-from app.services.reboot_manager import reboot_manager
+from typing import Dict, Optional
+import logging
+from app.core.auth import decode_token
+from app.middleware.auth_middleware import parse_cookie_fast, strip_bearer
+from app.services.websocket_manager import manager, notify_new_content, now_iso
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# Store active WebSocket connections
-active_connections: Set[WebSocket] = set()
+# Cookies the feed socket reads; everything else in the header is skipped
+WEBSOCKET_COOKIE_NAMES = (b"access_token", b"visitor_id")
+# Reply to the app-level "ping" older clients still send. Liveness itself is
+# uvicorn's protocol-level ping (ws_ping_interval/ws_ping_timeout, 20s each
+# by default), which also keeps nginx's proxy_read_timeout from firing.
+_PONG_MESSAGE = '{"type":"pong"}'
 
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.add(websocket)
-        reboot_manager.register_connection()
-        print(
-            f"✅ WebSocket connected. Total connections: {len(self.active_connections)}"
-        )
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.discard(websocket)
-        reboot_manager.unregister_connection()
-        print(
-            f"❌ WebSocket disconnected. Total connections: {len(self.active_connections)}"
-        )
-
-    async def broadcast(self, message: dict):
-        """Send message to all connected clients"""
-        disconnected = set()
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                print(f"Error sending to client: {e}")
-                disconnected.add(connection)
-
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
-
-    async def send_personal_message(self, message: dict, websocket: WebSocket):
-        """Send message to specific client"""
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            print(f"Error sending personal message: {e}")
-            self.disconnect(websocket)
-
-
-manager = ConnectionManager()
-
-
-def _extract_token_from_websocket(websocket: WebSocket) -> str | None:
+def _read_auth_headers(
+    websocket: WebSocket,
+) -> tuple[Optional[bytes], Dict[str, str]]:
+    """
+    Single pass over the raw handshake headers for Authorization and Cookie
+    (like AuthASGIMiddleware, which doesn't run for websockets). Only
+    WEBSOCKET_COOKIE_NAMES are parsed out of the Cookie header.
+    """
+    authorization: Optional[bytes] = None
+    cookies: Dict[str, str] = {}
+    for name, value in websocket.scope["headers"]:
+        if name == b"authorization":
+            authorization = value
+        elif name == b"cookie":
+            cookies = parse_cookie_fast(value, WEBSOCKET_COOKIE_NAMES)
+    return authorization, cookies
+
+
+def _extract_token_from_websocket(
+    websocket: WebSocket, authorization: Optional[bytes], cookies: Dict[str, str]
+) -> str | None:
     """Extract JWT token from WebSocket headers, cookies, or query params."""
     token = None
     # Try header first (for JS clients)
-    if "authorization" in websocket.headers:
-        auth_header = websocket.headers["authorization"]
-        if auth_header.lower().startswith("bearer "):
-            token = auth_header[7:]
+    if authorization is not None and authorization[:7].lower() == b"bearer ":
+        token = authorization[7:].decode("latin-1")
     # Try cookies
     if not token:
-        cookie_header = websocket.headers.get("cookie", "")
-        for part in cookie_header.split(";"):
-            if "access_token=" in part:
-                token = part.split("access_token=")[-1].strip()
+        cookie_token = cookies.get("access_token")
+        if cookie_token:
+            token = strip_bearer(cookie_token)
     # Try query param
     if not token:
         token = websocket.query_params.get("token")
     return token
 
 
-def _extract_visitor_id_from_cookies(websocket: WebSocket) -> str | None:
-    """Extract visitor_id from WebSocket cookies."""
-    cookie_header = websocket.headers.get("cookie", "")
-    visitor_id = None
-    for part in cookie_header.split(";"):
-        if "visitor_id=" in part:
-            visitor_id = part.split("visitor_id=")[-1].strip()
-    return visitor_id
-
-
-def _decode_jwt_token(token: str, logger) -> dict | None:
-    """Decode and validate JWT token, return payload or None."""
-    from app.core.auth import jwt, SECRET_KEY, ALGORITHM
+def _decode_jwt_token(token: str) -> dict | None:
+    """Decode and validate JWT token, return payload or None.
 
-    payload = None
-    if token:
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        except Exception as e:
-            safe_error = str(e).replace("\n", "").replace("\r", "")
-            logger.error(f"WebSocket token decode error: {safe_error}")
+    Goes through the shared verified-claims cache, so reconnect storms with
+    the same token skip signature verification.
+    """
+    if not token:
+        return None
+    payload = decode_token(token)
+    if payload is None:
+        logger.error("WebSocket token decode error: invalid or expired token")
     return payload
 
 
 async def _handle_websocket_connection(websocket: WebSocket, identifier: str):
-    """Handle WebSocket keepalive loop and message processing."""
+    """Handle the connection until the client goes away.
+
+    The receive loop only idles on the socket so a close is noticed; the
+    server pushes updates via broadcast and needs no client messages.
+    """
     try:
-        await websocket.send_json(
+        manager.send_personal_message(
             {
                 "type": "connected",
                 "message": f"Connected to Nexus feed updates as {identifier}",
-                "timestamp": datetime.now().isoformat(),
-            }
+                "timestamp": now_iso(),
+            },
+            websocket,
         )
         while True:
             data = await websocket.receive_text()
             if data == "ping":
-                await websocket.send_json({"type": "pong"})
+                manager.enqueue(websocket, _PONG_MESSAGE)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
-    except Exception as e:
-        import logging
-
-        logger = logging.getLogger("uvicorn.error")
-        logger.error(f"WebSocket error: {e}")
+    except Exception:
+        logger.exception("WebSocket error")
         manager.disconnect(websocket)
 
 
 @router.websocket("/feed-updates")
 async def websocket_feed_updates(websocket: WebSocket):
     """WebSocket endpoint for real-time feed updates."""
-    import logging
-
-    logger = logging.getLogger("uvicorn.error")
-
     # Extract and validate token
-    token = _extract_token_from_websocket(websocket)
-    safe_token = str(token).replace("\n", "").replace("\r", "") if token else None
-    logger.info(f"WebSocket received token: {safe_token}")
+    authorization, cookies = _read_auth_headers(websocket)
+    token = _extract_token_from_websocket(websocket, authorization, cookies)
 
     # Decode token to get user identity
-    payload = _decode_jwt_token(token, logger)
-    safe_payload = str(payload).replace("\n", "").replace("\r", "") if payload else None
-    logger.info(f"WebSocket decoded payload: {safe_payload}")
+    payload = _decode_jwt_token(token)
+    if logger.isEnabledFor(logging.DEBUG):
+        safe_payload = (
+            str(payload).replace("\n", "").replace("\r", "") if payload else None
+        )
+        logger.debug(
+            "WebSocket token present: %s, decoded payload: %s",
+            token is not None,
+            safe_payload,
+        )
 
     username = payload.get("sub") if payload else None
 
     # Handle anonymous connection
     if not username:
-        visitor_id = _extract_visitor_id_from_cookies(websocket)
+        visitor_id = cookies.get("visitor_id")
         safe_visitor_id = (
             str(visitor_id).replace("\n", "").replace("\r", "") if visitor_id else None
         )
-        logger.info(f"WebSocket accepted for anonymous visitor_id: {safe_visitor_id}")
+        logger.info("WebSocket accepted for anonymous visitor_id: %s", safe_visitor_id)
         await manager.connect(websocket)
         await _handle_websocket_connection(websocket, f"anonymous visitor {visitor_id}")
         return
 
     # Handle authenticated connection
     safe_username = username.replace("\n", "").replace("\r", "")
-    logger.info(f"WebSocket accepted for user: {safe_username}")
+    logger.info("WebSocket accepted for user: %s", safe_username)
     await manager.connect(websocket)
     await _handle_websocket_connection(websocket, username)
 
 
-async def notify_new_content(count: int = 1, category: str = None):
-    """
-    Notify all connected clients about new content
-
-    Args:
-        count: Number of new content items
-        category: Optional category filter
-    """
-    message = {
-        "type": "new_content",
-        "count": count,
-        "category": category,
-        "timestamp": datetime.now().isoformat(),
-    }
-    await manager.broadcast(message)
-    print(f"📢 Broadcasted new content notification: {count} items")
-
-
-# Export manager for use in other modules
+# Re-exported for modules that imported them from here
 __all__ = ["router", "manager", "notify_new_content"]
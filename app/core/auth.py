@@ -1,10 +1,11 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 from passlib.hash import bcrypt_sha256
 from passlib.handlers.bcrypt import bcrypt_sha256 as bcrypt_sha256_handler
 import logging
 from app.core.config import settings
+from app.core.auth_cache import cache_claims, get_cached_claims
 
 # Password hashing
 
@@ -13,6 +14,10 @@ SECRET_KEY = settings.secret_key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Key object built once; jose otherwise re-constructs it from the raw secret
+# on every encode/decode.
+_JWT_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
+
 
 def verify_password(plain_password, hashed_password):
     # Use bcrypt_sha256 for robust password verification
@@ -35,16 +40,28 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def verify_token(token: str):
+def decode_token(token: str) -> Optional[dict]:
+    """Return the verified claims of a token, or None if it is invalid/expired"""
+    claims = get_cached_claims(token)
+    if claims is not None:
+        return claims
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
+        claims = jwt.decode(token, _JWT_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
+    cache_claims(token, claims)
+    return claims
+
+
+def verify_token(token: str):
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    username: str = payload.get("sub")
+    if username is None:
+        return None
+    return username
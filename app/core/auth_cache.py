@@ -0,0 +1,57 @@
+"""
+Verified JWT claims cache
+
+Keeps the decoded claims of recently verified tokens for a few seconds so
+repeated requests carrying the same token skip signature verification.
+Entries are keyed by a SHA-256 digest of the token (the raw token is never
+stored) and never outlive the token's own ``exp``.
+"""
+
+import hashlib
+import time
+from typing import Optional
+
+# Upper bound on how long verified claims are reused without re-checking
+AUTH_CACHE_TTL = 10  # seconds
+AUTH_CACHE_MAX_SIZE = 10_000
+
+# digest -> (claims, expires_at)
+_claims_cache: dict[bytes, tuple[dict, float]] = {}
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def get_cached_claims(token: str) -> Optional[dict]:
+    """Return cached claims for a token if present and not expired"""
+    key = _token_key(token)
+    entry = _claims_cache.get(key)
+    if entry is None:
+        return None
+    claims, expires_at = entry
+    if expires_at <= time.time():
+        _claims_cache.pop(key, None)
+        return None
+    return claims
+
+
+def cache_claims(token: str, claims: dict) -> None:
+    """Remember verified claims until min(token exp, now + AUTH_CACHE_TTL)"""
+    now = time.time()
+    expires_at = now + AUTH_CACHE_TTL
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, float(exp))
+    if expires_at <= now:
+        return
+
+    if len(_claims_cache) >= AUTH_CACHE_MAX_SIZE:
+        # Dicts keep insertion order, so the first key is the oldest entry
+        _claims_cache.pop(next(iter(_claims_cache)), None)
+    _claims_cache[_token_key(token)] = (claims, expires_at)
+
+
+def clear_auth_cache() -> None:
+    """Drop all cached claims (e.g. after rotating the secret key)"""
+    _claims_cache.clear()
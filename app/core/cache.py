@@ -0,0 +1,138 @@
+"""
+Response cache
+
+Small async key/value cache for serialized responses (bytes). Uses Redis
+when ``CACHE_BACKEND=redis`` and the ``redis`` package is installed, so all
+workers share entries and invalidation; otherwise falls back to a bounded
+in-process TTL dict (per worker).
+
+Keys are namespaced with ``CACHE_PREFIX``; ``clear(prefix)`` drops every key
+under a sub-prefix (e.g. ``"feed:"``) after content ingestion.
+
+Per-session and per-user entries are invalidated by the request that changes
+them, which a per-worker dict can't propagate to the other workers. Callers
+only cache those when ``response_cache.shared`` is true.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from app.core.config import settings
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # optional dependency
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "nexus:"
+# Sub-prefix for anonymous feed pages; cleared when new content is ingested
+FEED_CACHE_PREFIX = "feed:"
+# Sub-prefix for per-article related items; also cleared on ingestion
+RELATED_CACHE_PREFIX = "related:"
+# Per-session /history/seen-ids bodies; dropped when a "seen" view is recorded
+SEEN_IDS_CACHE_PREFIX = "seen:"
+# Per-user hover tracker debug flag; dropped when an admin changes it
+HOVER_SETTINGS_CACHE_PREFIX = "htcfg:"
+# Per-session view history totals; dropped when history is recorded or cleared
+HISTORY_COUNT_CACHE_PREFIX = "hcnt:"
+# Topic list pages; cleared when topics are created or refreshed from trends
+TOPICS_CACHE_PREFIX = "topics:"
+MEMORY_CACHE_MAX_SIZE = 2048
+
+
+class MemoryCacheBackend:
+    """Per-process TTL cache; oldest entry is evicted when full."""
+
+    def __init__(self, max_size: int = MEMORY_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._data: dict[str, tuple[bytes, float]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        if len(self._data) >= self.max_size and key not in self._data:
+            self._data.pop(next(iter(self._data)), None)
+        self._data[key] = (value, time.time() + ttl)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def clear(self, prefix: str) -> None:
+        for key in [k for k in self._data if k.startswith(prefix)]:
+            self._data.pop(key, None)
+
+
+class RedisCacheBackend:
+    """Shared cache across workers backed by Redis."""
+
+    def __init__(self, url: str):
+        self._redis = aioredis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self._redis.set(key, value, ex=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(key)
+
+    async def clear(self, prefix: str) -> None:
+        keys = [key async for key in self._redis.scan_iter(match=f"{prefix}*")]
+        if keys:
+            await self._redis.delete(*keys)
+
+
+class ResponseCache:
+    """Namespaced cache facade; backend errors degrade to cache misses."""
+
+    def __init__(self):
+        if settings.CACHE_BACKEND == "redis" and aioredis is not None:
+            self.backend = RedisCacheBackend(settings.REDIS_URL)
+        else:
+            if settings.CACHE_BACKEND == "redis":
+                logger.warning("redis package not installed; using in-memory cache")
+            self.backend = MemoryCacheBackend()
+        # Whether every worker sees the same entries (and deletes)
+        self.shared = isinstance(self.backend, RedisCacheBackend)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self.backend.get(CACHE_PREFIX + key)
+        except Exception as e:
+            logger.warning("Cache get failed for %s: %s", key, e)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        try:
+            await self.backend.set(CACHE_PREFIX + key, value, ttl)
+        except Exception as e:
+            logger.warning("Cache set failed for %s: %s", key, e)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.backend.delete(CACHE_PREFIX + key)
+        except Exception as e:
+            logger.warning("Cache delete failed for %s: %s", key, e)
+
+    async def clear(self, prefix: str = "") -> None:
+        """Remove every cached key starting with ``prefix``"""
+        try:
+            await self.backend.clear(CACHE_PREFIX + prefix)
+        except Exception as e:
+            logger.warning("Cache clear failed for %s: %s", prefix, e)
+
+
+# Global instance
+response_cache = ResponseCache()
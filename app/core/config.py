@@ -33,8 +33,14 @@ class Settings(BaseSettings):
     DB_PASS: str = "RdkV6Q$!"
     DB_NAME: str = "nexus"
 
-    # Redis (for Celery if needed)
+    # Redis (response cache, Celery if needed)
     REDIS_URL: str = "redis://localhost:6379/0"
+    # Response cache backend: "memory" (per worker) or "redis" (shared)
+    CACHE_BACKEND: str = "memory"
+
+    # Related articles: PostgreSQL full-text ranking (needs migration 015)
+    # instead of substring matching + Python scoring
+    RELATED_CONTENT_FTS: bool = True
 
     # Security
     secret_key: str = "your-secret-key-change-this-in-production"
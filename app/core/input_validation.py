@@ -10,6 +10,14 @@ import urllib.parse
 from typing import Any, Dict, List, Optional, Union
 from fastapi import HTTPException
 
+# exclude_ids: allowed characters, and the individual IDs within it
+_EXCLUDE_IDS_RE = re.compile(r"[\d,\s]+")
+_ID_RE = re.compile(r"\d+")
+MAX_CONTENT_ID = 999999999
+# Infinite scroll keeps appending seen IDs; only the most recent ones are kept
+MAX_EXCLUDE_IDS = 500
+MAX_EXCLUDE_IDS_LENGTH = 8192
+
 
 class InputValidator:
     """Centralized input validation and sanitization."""
@@ -194,37 +202,30 @@ class InputValidator:
 
         return category_list if category_list else None
 
-    @classmethod
-    def _parse_id_string(cls, id_str: str) -> Optional[int]:
-        """Parse and validate a single ID string."""
-        id_str = id_str.strip()
-        if id_str:
-            return cls.validate_integer(id_str, min_val=1, max_val=999999999)
-        return None
-
     @classmethod
     def validate_exclude_ids(cls, exclude_ids: Optional[str]) -> List[int]:
         """Validate and parse exclude_ids parameter."""
         if not exclude_ids:
             return []
 
-        exclude_ids = cls.sanitize_string(exclude_ids, max_length=500)
+        # Keep the tail (newest IDs), dropping a possibly cut-off leading ID.
+        # The fullmatch below only admits digits, commas and whitespace, so
+        # no further sanitizing is needed.
+        if len(exclude_ids) > MAX_EXCLUDE_IDS_LENGTH:
+            exclude_ids = exclude_ids[-MAX_EXCLUDE_IDS_LENGTH:].partition(",")[2]
 
-        if not re.match(r"^[\d,\s]+$", exclude_ids):
+        if not _EXCLUDE_IDS_RE.fullmatch(exclude_ids):
             raise HTTPException(
                 status_code=400,
                 detail="Invalid exclude_ids format: only numbers and commas allowed",
             )
 
-        try:
-            ids = []
-            for id_str in exclude_ids.split(","):
-                parsed_id = cls._parse_id_string(id_str)
-                if parsed_id is not None:
-                    ids.append(parsed_id)
-            return ids
-        except Exception:
+        # Dedupe preserving order, then keep the last MAX_EXCLUDE_IDS
+        ids = list(dict.fromkeys(map(int, _ID_RE.findall(exclude_ids))))
+        ids = ids[-MAX_EXCLUDE_IDS:]
+        if ids and (min(ids) < 1 or max(ids) > MAX_CONTENT_ID):
             raise HTTPException(status_code=400, detail="Invalid exclude_ids format")
+        return ids
 
     @classmethod
     def _validate_cursor_format(cls, cursor: str) -> None:
@@ -283,8 +284,8 @@ class InputValidator:
         Validate session_token to prevent injection attacks.
 
         Session tokens should be:
-        - UUIDs (36 chars)
-        - Or valid UUID format strings
+        - token_urlsafe(16) strings (22 chars)
+        - Or legacy UUIDs (36 chars)
 
         Args:
             session_token: The session token to validate
@@ -300,8 +301,8 @@ class InputValidator:
 
         session_token = str(session_token).strip()
 
-        # Session tokens are typically UUIDs - should be exactly 36 chars
-        # But allow some flexibility for other token formats (alphanumeric, hyphens, underscores)
+        # New tokens are 22-char token_urlsafe(16) strings; older sessions
+        # still carry 36-char UUIDs (alphanumeric, hyphens, underscores)
         if len(session_token) < 20 or len(session_token) > 64:
             raise HTTPException(status_code=400, detail="Invalid session token format")
 
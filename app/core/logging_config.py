@@ -0,0 +1,49 @@
+"""
+Non-blocking logging setup.
+
+Moves the handlers of the root and uvicorn loggers behind a
+``QueueHandler``/``QueueListener`` pair so that formatting and the write
+syscall happen on a listener thread; logging from a coroutine only enqueues
+the record.
+"""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import List
+
+# Loggers whose existing handlers are moved behind a queue
+QUEUED_LOGGERS = ("", "uvicorn", "uvicorn.error", "uvicorn.access")
+
+_listeners: List[QueueListener] = []
+
+
+def setup_queue_logging() -> None:
+    """Route configured log handlers through background listener threads.
+
+    Each logger keeps its own handler set (one queue + listener per logger),
+    so records are still written to the same destinations as before.
+    Safe to call more than once.
+    """
+    if _listeners:
+        return
+
+    for name in QUEUED_LOGGERS:
+        target = logging.getLogger(name)
+        handlers = [h for h in target.handlers if not isinstance(h, QueueHandler)]
+        if not handlers:
+            continue
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        for handler in handlers:
+            target.removeHandler(handler)
+        target.addHandler(QueueHandler(log_queue))
+        listener.start()
+        _listeners.append(listener)
+
+
+def stop_queue_logging() -> None:
+    """Flush queued records and stop the listener threads"""
+    while _listeners:
+        _listeners.pop().stop()
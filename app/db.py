@@ -1,22 +1,74 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import text
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+import asyncio
 import os
+from uuid import uuid4
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Pool sizing. Every worker process has its own pool, so
+# workers * (pool_size + max_overflow) must stay below Postgres
+# max_connections minus a margin for admin/migration/cron sessions.
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "100"))
+DB_WORKERS = int(os.getenv("WEB_CONCURRENCY", "3"))  # gunicorn_conf.workers
+DB_RESERVED_CONNECTIONS = 5
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_SIZE = int(
+    os.getenv(
+        "DB_POOL_SIZE",
+        max(
+            5,
+            (DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS) // DB_WORKERS
+            - DB_MAX_OVERFLOW,
+        ),
+    )
+)
+# Set when DATABASE_URL points at PgBouncer (transaction pooling): PgBouncer
+# does the pooling, and prepared statements can't survive across its
+# server connections, so both client-side caches are disabled. The
+# statements asyncpg still prepares get unique names so they can't collide
+# on a server connection another client already used.
+DB_USE_PGBOUNCER = os.getenv("DB_USE_PGBOUNCER", "").lower() in ("1", "true", "yes")
+
+if DB_USE_PGBOUNCER:
+    _pool_args = {"poolclass": NullPool}
+    _connect_args = {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+else:
+    _pool_args = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,  # Recycle connections every 30 minutes
+        "pool_timeout": 30,
+        # Reuse the most recently returned connection so surplus ones stay
+        # idle and get recycled after bursts instead of all staying warm
+        "pool_use_lifo": True,
+    }
+    _connect_args = {
+        # asyncpg server-side prepared statements, per connection
+        "statement_cache_size": 1024,
+        # SQLAlchemy asyncpg adapter's prepared statement cache
+        "prepared_statement_cache_size": 256,
+    }
+
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
-    poolclass=AsyncAdaptedQueuePool,
-    pool_size=25,  # Increased for aggressive connection pooling with 3 workers
-    max_overflow=10,  # Increased for better burst handling
-    pool_pre_ping=True,
-    pool_recycle=1800,  # Recycle connections every 30 minutes
-    pool_timeout=30,
+    # Compiled-statement cache shared by all sessions (default is 500); the
+    # hot auth/content lookups differ only in bound parameters.
+    query_cache_size=1200,
+    connect_args=_connect_args,
+    **_pool_args,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -26,3 +78,16 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 Base = declarative_base()
+
+
+async def warm_pool(connections: int = 5) -> None:
+    """Open and check in a few pooled connections so the first requests
+    don't pay connection setup latency."""
+    if DB_USE_PGBOUNCER:
+        return  # NullPool keeps nothing to warm
+
+    async def _touch():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_touch() for _ in range(connections)))
@@ -2,7 +2,7 @@ from fastapi import FastAPI, Request  # type: ignore
 from fastapi.middleware.cors import CORSMiddleware  # type: ignore
 from fastapi.staticfiles import StaticFiles  # type: ignore
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, ORJSONResponse, RedirectResponse
 import os
 import asyncio
 
@@ -17,10 +17,14 @@ from app.api.v1.routes import (
     auth as v1_auth,
 )
 from app.core.config import settings
+from app.db import AsyncSessionLocal, engine, warm_pool
+from app.core.logging_config import setup_queue_logging, stop_queue_logging
 from app.services.scheduler_service import scheduler_service
 from app.services.intrusion_service import ids_service
 from app.services.reboot_manager import reboot_manager
+from app.services.interaction_buffer import interaction_buffer
 from app.middleware.security_middleware import SecurityMiddleware
+from app.middleware.auth_middleware import AuthASGIMiddleware
 
 # Configure Jinja2 templates
 templates = Jinja2Templates(directory="app/templates")
@@ -33,8 +37,13 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
+# Shared engine/session factory used by the get_db / get_ro_conn dependencies
+app.state.engine = engine
+app.state.session_factory = AsyncSessionLocal
+
 # Serve /login and /register as static files
 from fastapi.responses import FileResponse
 
@@ -48,6 +57,8 @@ async def startup_event():
 
     logger = logging.getLogger("uvicorn")
     try:
+        # Log I/O happens on listener threads from here on
+        setup_queue_logging()
         logger.info("=" * 80)
         logger.info(
             f"[START] Nexus API Started - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
@@ -55,6 +66,12 @@ async def startup_event():
         logger.info(f"Version: {settings.VERSION}")
         logger.info(f"Environment: {'Development' if settings.debug else 'Production'}")
         logger.info("=" * 80)
+        try:
+            await warm_pool()
+        except Exception as e:
+            logger.warning(f"[WARN] Database pool warm-up failed: {e}")
+        logger.info(f"DB pool: {engine.pool.status()}")
+        interaction_buffer.start()
         scheduler_service.start()
         ids_service.start()
         reboot_manager.start()
@@ -85,7 +102,12 @@ async def shutdown_event():
     scheduler_service.stop()
     ids_service.stop()
     reboot_manager.stop()
+    await interaction_buffer.stop()
+    stop_queue_logging()
+
 
+# Extract auth token/cookies once per request (innermost, pure ASGI)
+app.add_middleware(AuthASGIMiddleware)
 
 # Add security middleware first
 app.add_middleware(SecurityMiddleware)
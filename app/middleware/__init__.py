@@ -1,5 +1,6 @@
 """Middleware package for Nexus application."""
 
 from .security_middleware import SecurityMiddleware
+from .auth_middleware import AuthASGIMiddleware
 
-__all__ = ["SecurityMiddleware"]
\ No newline at end of file
+__all__ = ["SecurityMiddleware", "AuthASGIMiddleware"]
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Pure ASGI middleware that extracts auth credentials once per request.
+
+Scans the raw ``scope["headers"]`` for the Authorization and Cookie headers,
+pulls out the bearer token and the two cookies the API reads
+(``access_token`` and ``nexus_session``) and pre-validates the bearer token
+through the cached JWT decoder. Results are stored in ``scope["state"]`` so
+dependencies can read them from ``request.state`` without re-parsing headers.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from app.core.auth import decode_token
+
+# Cookies the application actually reads; everything else is skipped
+AUTH_COOKIE_NAMES = (b"access_token", b"nexus_session")
+
+
+def parse_cookie_fast(
+    header: bytes, names: Tuple[bytes, ...] = AUTH_COOKIE_NAMES
+) -> Dict[str, str]:
+    """
+    Extract only the named (by default auth-related) cookies from a raw
+    Cookie header.
+
+    Single pass over ``; ``-separated pairs without building a SimpleCookie.
+    Surrounding double quotes (used when a value contains a space, e.g.
+    ``"Bearer <jwt>"``) are stripped.
+    """
+    cookies: Dict[str, str] = {}
+    for pair in header.split(b";"):
+        eq = pair.find(b"=")
+        if eq < 0:
+            continue
+        name = pair[:eq].strip()
+        if name not in names:
+            continue
+        value = pair[eq + 1 :].strip()
+        if len(value) >= 2 and value[:1] == b'"' and value[-1:] == b'"':
+            value = value[1:-1]
+        cookies[name.decode("latin-1")] = value.decode("latin-1")
+    return cookies
+
+
+def strip_bearer(value: str) -> str:
+    """Remove a leading ``Bearer `` prefix if present"""
+    return value[7:] if value.startswith("Bearer ") else value
+
+
+class AuthASGIMiddleware:
+    """Populate ``request.state`` with auth token, claims and session cookie."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        authorization: Optional[bytes] = None
+        cookie_header: Optional[bytes] = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value
+            elif name == b"cookie":
+                cookie_header = value
+
+        token: Optional[str] = None
+        if authorization is not None and authorization.startswith(b"Bearer "):
+            token = authorization[7:].decode("latin-1")
+
+        cookies = parse_cookie_fast(cookie_header) if cookie_header else {}
+
+        state = scope.setdefault("state", {})
+        state["auth_token"] = token
+        state["auth_claims"] = decode_token(token) if token else None
+        state["cookies"] = cookies
+        state["session_cookie"] = cookies.get("nexus_session")
+        cookie_token = cookies.get("access_token")
+        state["cookie_token"] = strip_bearer(cookie_token) if cookie_token else None
+
+        await self.app(scope, receive, send)
@@ -4,7 +4,7 @@ SQLAlchemy ORM Models
 
 from app.models.user import User, UserSession
 from app.models.topic import Topic
-from app.models.content import ContentItem
+from app.models.content import ContentItem, ContentRelated
 from app.models.interaction import UserInteraction, UserInterestProfile
 
 __all__ = [
@@ -12,6 +12,7 @@ __all__ = [
     "UserSession",
     "Topic",
     "ContentItem",
+    "ContentRelated",
     "UserInteraction",
     "UserInterestProfile",
 ]
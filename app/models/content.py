@@ -11,9 +11,11 @@ from sqlalchemy import (
     JSON,
     ForeignKey,
     LargeBinary,
+    Index,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.db import Base
 
 
@@ -54,3 +56,28 @@ class ContentItem(Base):
     topic = relationship("Topic", back_populates="content_items")
     interactions = relationship("UserInteraction", back_populates="content_item")
     view_history = relationship("ContentViewHistory", back_populates="content_item")
+
+    __table_args__ = (
+        # Per-topic listing: range scan in id order, no heap sort
+        Index("ix_content_items_topic_id_id", "topic_id", "id"),
+        # Feed: published items newest first, walked in order under LIMIT
+        Index(
+            "ix_content_items_published_created_at",
+            text("created_at DESC"),
+            postgresql_where=text("is_published"),
+        ),
+    )
+
+
+class ContentRelated(Base):
+    """Precomputed related-content IDs per item, refreshed by the scheduler."""
+
+    __tablename__ = "content_related"
+
+    content_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("content_items.id", ondelete="CASCADE"), primary_key=True
+    )
+    related_ids: Mapped[List[int]] = mapped_column(ARRAY(Integer), default=list)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), onupdate=func.now(), index=True
+    )
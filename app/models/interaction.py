@@ -1,8 +1,8 @@
 """Interaction-related models."""
 
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.db import Base
 
 
@@ -25,6 +25,17 @@ class UserInteraction(Base):
     session = relationship("UserSession", back_populates="interactions")
     content_item = relationship("ContentItem", back_populates="interactions")
 
+    __table_args__ = (
+        # One "view" row per session and item; track/duration updates upsert it
+        Index(
+            "ix_user_interactions_session_view_unique",
+            "session_id",
+            "content_item_id",
+            unique=True,
+            postgresql_where=text("interaction_type = 'view'"),
+        ),
+    )
+
 
 class UserInterestProfile(Base):
     __tablename__ = "user_interest_profiles"
@@ -1,8 +1,8 @@
 """User-related models."""
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.db import Base
 
 
@@ -17,7 +17,8 @@ class User(Base):
     is_admin = Column(Boolean, default=False)
     debug_mode = Column(Boolean, default=False)
     must_reset_password = Column(Boolean, default=False)
-    password_reset_token = Column(String(255), nullable=True, unique=True)
+    # SHA-256 hex digest of the emailed reset token; the raw token is never stored
+    password_reset_token_hash = Column(String(64), nullable=True)
     password_reset_expires = Column(DateTime(timezone=True), nullable=True)
     last_login = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), default=func.now())
@@ -32,6 +33,15 @@ class User(Base):
     )
     view_history = relationship("ContentViewHistory", back_populates="user")
 
+    __table_args__ = (
+        Index(
+            "ix_users_password_reset_token_hash",
+            "password_reset_token_hash",
+            unique=True,
+            postgresql_where=text("password_reset_token_hash IS NOT NULL"),
+        ),
+    )
+
 
 class UserSession(Base):
     __tablename__ = "user_sessions"
@@ -76,6 +86,25 @@ class ContentViewHistory(Base):
     user = relationship("User", back_populates="view_history")
     content_item = relationship("ContentItem", back_populates="view_history")
 
+    __table_args__ = (
+        # History pages: filter by session (+ type), newest first, index-only
+        Index(
+            "ix_content_view_history_token_type_viewed",
+            "session_token",
+            "view_type",
+            viewed_at.desc(),
+            postgresql_include=["content_id", "content_slug", "time_spent_seconds"],
+        ),
+        # One "seen" row per session and item; record_view upserts against it
+        Index(
+            "ix_content_view_history_seen_unique",
+            "session_token",
+            "content_id",
+            unique=True,
+            postgresql_where=text("view_type = 'seen'"),
+        ),
+    )
+
 
 class BrevoEmailEvent(Base):
     """Track Brevo email events (bounces, complaints, invalid emails, etc.)."""
@@ -94,3 +123,13 @@ class BrevoEmailEvent(Base):
     checked_at = Column(
         DateTime(timezone=True), nullable=True
     )  # When the registration page last checked
+
+    __table_args__ = (
+        # Latest event per email, index-only for the registration checks
+        Index(
+            "ix_brevo_email_events_email_received_at",
+            "email",
+            received_at.desc(),
+            postgresql_include=["event_type"],
+        ),
+    )
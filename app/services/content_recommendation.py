@@ -11,13 +11,34 @@ Provides personalized content recommendations based on:
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Set
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc, cast, String
+from sqlalchemy import (
+    select,
+    func,
+    and_,
+    or_,
+    desc,
+    cast,
+    String,
+    Integer,
+    all_,
+    literal,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from collections import defaultdict
 import re
 
 from app.models import ContentItem, Topic, UserInteraction, UserInterestProfile, User
 
 
+def _exclude_ids_clause(exclude_ids):
+    """
+    ``content_items.id != ALL(:ids)`` with the IDs bound as one integer[]
+    parameter, so the SQL text (and prepared statement) is the same no matter
+    how many IDs the client has accumulated.
+    """
+    return ContentItem.id != all_(literal(list(exclude_ids), ARRAY(Integer)))
+
+
 class ContentRecommendationService:
     @staticmethod
     def _extract_first_image_url(html_text: Optional[str]) -> Optional[str]:
@@ -219,7 +240,7 @@ class ContentRecommendationService:
             Topic.category != "Reference",
         ]
         if all_excluded:
-            where_clauses.append(ContentItem.id.notin_(all_excluded))
+            where_clauses.append(_exclude_ids_clause(all_excluded))
 
         query = (
             select(ContentItem, Topic)
@@ -366,7 +387,7 @@ class ContentRecommendationService:
             Topic.category != "Reference",
         ]
         if exclude_ids:
-            where_clauses.append(ContentItem.id.notin_(exclude_ids))
+            where_clauses.append(_exclude_ids_clause(exclude_ids))
 
         return (
             select(ContentItem, Topic)
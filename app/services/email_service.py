@@ -15,6 +15,7 @@ import asyncio
 import requests
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from string import Template
 from typing import Optional
 from app.core.config import settings
 import logging
@@ -22,6 +23,68 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Registration email bodies, compiled once at import. Only the username and
+# admin contact vary per message.
+_REGISTRATION_TEXT_TEMPLATE = Template(
+    """
+Welcome to Nexus, $username!
+
+Thank you for registering. Your account has been created successfully.
+
+You can now log in and start personalizing your news feed.
+
+If you have any questions or need assistance, please contact us at $admin_email.
+
+Happy reading!
+The Nexus Team
+"""
+)
+
+_REGISTRATION_HTML_TEMPLATE = Template(
+    """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background-color: #007bff; color: white; padding: 20px; border-radius: 5px; text-align: center; }
+        .content { padding: 20px; background-color: #f8f9fa; border-radius: 5px; margin-top: 20px; }
+        .footer { margin-top: 20px; font-size: 12px; color: #666; text-align: center; }
+        .button { display: inline-block; padding: 10px 20px; background-color: #007bff; color: white; text-decoration: none; border-radius: 3px; margin-top: 10px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Welcome to Nexus! 🚀</h1>
+        </div>
+        
+        <div class="content">
+            <p>Hello <strong>$username</strong>,</p>
+            
+            <p>Thank you for registering with Nexus! Your account has been created successfully.</p>
+            
+            <p>You can now log in and start personalizing your news feed with the topics and sources you care about.</p>
+            
+            <p>
+                <a href="https://comdat.ca" class="button">Go to Nexus</a>
+            </p>
+            
+            <p>If you have any questions or need assistance, please don't hesitate to reach out to us.</p>
+        </div>
+        
+        <div class="footer">
+            <p>Best regards,<br>The Nexus Team</p>
+            <p><small>If you did not create this account, please contact us immediately at $admin_email</small></p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+)
+
+
 class EmailService:
     """Service for sending emails via SMTP or API."""
 
@@ -172,60 +235,9 @@ class EmailService:
         """Send welcome email to newly registered user."""
         subject = "Welcome to Nexus! 🚀"
 
-        body_text = f"""
-Welcome to Nexus, {username}!
-
-Thank you for registering. Your account has been created successfully.
-
-You can now log in and start personalizing your news feed.
-
-If you have any questions or need assistance, please contact us at {self.admin_email}.
-
-Happy reading!
-The Nexus Team
-"""
-
-        body_html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background-color: #007bff; color: white; padding: 20px; border-radius: 5px; text-align: center; }}
-        .content {{ padding: 20px; background-color: #f8f9fa; border-radius: 5px; margin-top: 20px; }}
-        .footer {{ margin-top: 20px; font-size: 12px; color: #666; text-align: center; }}
-        .button {{ display: inline-block; padding: 10px 20px; background-color: #007bff; color: white; text-decoration: none; border-radius: 3px; margin-top: 10px; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>Welcome to Nexus! 🚀</h1>
-        </div>
-        
-        <div class="content">
-            <p>Hello <strong>{username}</strong>,</p>
-            
-            <p>Thank you for registering with Nexus! Your account has been created successfully.</p>
-            
-            <p>You can now log in and start personalizing your news feed with the topics and sources you care about.</p>
-            
-            <p>
-                <a href="https://comdat.ca" class="button">Go to Nexus</a>
-            </p>
-            
-            <p>If you have any questions or need assistance, please don't hesitate to reach out to us.</p>
-        </div>
-        
-        <div class="footer">
-            <p>Best regards,<br>The Nexus Team</p>
-            <p><small>If you did not create this account, please contact us immediately at {self.admin_email}</small></p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        params = {"username": username, "admin_email": self.admin_email}
+        body_text = _REGISTRATION_TEXT_TEMPLATE.substitute(params)
+        body_html = _REGISTRATION_HTML_TEMPLATE.substitute(params)
 
         return self.send_email(to_email, subject, body_html, body_text, username)
 
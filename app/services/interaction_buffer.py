@@ -0,0 +1,130 @@
+"""
+Interaction Write Buffer
+
+High-frequency telemetry (hover "interest" events) is queued in memory and
+written in batches by a background task instead of one INSERT (and one
+pooled connection) per request. A batch is flushed when it reaches
+INTERACTION_FLUSH_BATCH events or INTERACTION_FLUSH_INTERVAL seconds after
+its first event. When the queue is full, new events are dropped so a
+traffic spike can't exhaust memory or the DB pool.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app.db import AsyncSessionLocal
+from app.services.session_service import record_interactions_bulk
+
+logger = logging.getLogger(__name__)
+
+INTERACTION_QUEUE_MAX_SIZE = 10_000
+INTERACTION_FLUSH_BATCH = 500
+INTERACTION_FLUSH_INTERVAL = 0.5  # seconds
+
+
+class InteractionBuffer:
+    def __init__(self, max_size: int = INTERACTION_QUEUE_MAX_SIZE):
+        self.max_size = max_size
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Create the queue and start the flush task (call from startup)"""
+        if self._task is not None:
+            return
+        self.queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info("[OK] Interaction buffer started")
+
+    async def stop(self):
+        """Stop the flush task and write whatever is still queued"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        remaining = []
+        while not self.queue.empty():
+            remaining.append(self.queue.get_nowait())
+        await self._flush(remaining)
+        logger.info("[STOP] Interaction buffer stopped")
+
+    def enqueue(
+        self,
+        session_token: str,
+        content_item_id: int,
+        interaction_type: str,
+        duration_seconds: int = 0,
+    ) -> bool:
+        """Queue an interaction; returns False if it was dropped"""
+        if self.queue is None:
+            return False
+        try:
+            self.queue.put_nowait(
+                {
+                    "session_token": session_token,
+                    "content_item_id": content_item_id,
+                    "interaction_type": interaction_type,
+                    "duration_seconds": duration_seconds,
+                    "created_at": datetime.now(timezone.utc),
+                }
+            )
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        batch: list[dict] = []
+        deadline = 0.0
+        try:
+            while True:
+                timeout = None if not batch else max(0.0, deadline - loop.time())
+                try:
+                    event = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    if not batch:
+                        deadline = loop.time() + INTERACTION_FLUSH_INTERVAL
+                    batch.append(event)
+                    if len(batch) < INTERACTION_FLUSH_BATCH and loop.time() < deadline:
+                        continue
+
+                await self._flush(batch)
+                batch = []
+        except asyncio.CancelledError:
+            await self._flush(batch)
+            raise
+
+    async def _flush(self, batch: list[dict]):
+        if not batch:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await record_interactions_bulk(db, batch)
+        except IntegrityError:
+            # An item was deleted between the existence check and the insert;
+            # write the rows one at a time so only the bad one is lost
+            for event in batch:
+                try:
+                    async with AsyncSessionLocal() as db:
+                        await record_interactions_bulk(db, [event])
+                except Exception as e:
+                    logger.error("[ERROR] Failed to write buffered interaction: %s", e)
+        except Exception as e:
+            logger.error(
+                "[ERROR] Failed to write %d buffered interactions: %s", len(batch), e
+            )
+
+
+# Global buffer instance
+interaction_buffer = InteractionBuffer()
@@ -0,0 +1,119 @@
+"""
+Related Content Precomputation
+
+Fills the ``content_related`` table (content_id -> related_ids[]) from a
+scheduled job so article views read related items with one primary-key
+lookup plus one ``id IN (...)`` query instead of running the related-content
+search per request. Items without a row yet fall back to live computation.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import Row, select, or_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from app.db import AsyncSessionLocal
+from app.models import ContentItem, ContentRelated
+
+logger = logging.getLogger(__name__)
+
+# Items recomputed per job run, newest first
+RELATED_REFRESH_BATCH = 500
+# Rows older than this are recomputed so new articles show up as related
+RELATED_MAX_AGE = timedelta(hours=24)
+
+# Columns a related item needs (scoring + API payload); skips content_text
+# and image_data, which are by far the largest columns
+RELATED_ITEM_COLUMNS = (
+    ContentItem.id,
+    ContentItem.title,
+    ContentItem.description,
+    ContentItem.category,
+    ContentItem.tags,
+    ContentItem.source_urls,
+    ContentItem.source_metadata,
+    ContentItem.created_at,
+)
+
+
+async def get_precomputed_related(
+    db: AsyncSession, content_id: int
+) -> Optional[List[Row]]:
+    """
+    Related items from content_related, in stored rank order.
+
+    Returns None when the item has not been precomputed yet.
+    """
+    related_ids = await db.scalar(
+        select(ContentRelated.related_ids).where(
+            ContentRelated.content_id == content_id
+        )
+    )
+    if related_ids is None:
+        return None
+    if not related_ids:
+        return []
+
+    result = await db.execute(
+        select(*RELATED_ITEM_COLUMNS).where(
+            ContentItem.id.in_(related_ids), ContentItem.is_published == True
+        )
+    )
+    by_id = {item.id: item for item in result}
+    return [by_id[item_id] for item_id in related_ids if item_id in by_id]
+
+
+async def refresh_related_content(batch_size: int = RELATED_REFRESH_BATCH) -> int:
+    """Recompute missing or stale content_related rows. Returns rows written."""
+    # Imported lazily: the search lives with the content routes
+    from app.api.routes.content import find_related_content
+
+    cutoff = datetime.now(timezone.utc) - RELATED_MAX_AGE
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(ContentItem)
+            .options(
+                load_only(
+                    ContentItem.id,
+                    ContentItem.title,
+                    ContentItem.description,
+                    ContentItem.source_metadata,
+                )
+            )
+            .outerjoin(ContentRelated, ContentRelated.content_id == ContentItem.id)
+            .where(
+                ContentItem.is_published == True,
+                or_(
+                    ContentRelated.content_id.is_(None),
+                    ContentRelated.updated_at < cutoff,
+                ),
+            )
+            .order_by(ContentItem.created_at.desc())
+            .limit(batch_size)
+        )
+        items = list(result.scalars())
+
+        for content in items:
+            related = await find_related_content(db, content)
+            stmt = pg_insert(ContentRelated).values(
+                content_id=content.id,
+                related_ids=[item.id for item in related],
+                updated_at=func.now(),
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ContentRelated.content_id],
+                set_={
+                    "related_ids": stmt.excluded.related_ids,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            await db.execute(stmt)
+
+        await db.commit()
+
+    logger.info("Precomputed related content for %d items", len(items))
+    return len(items)
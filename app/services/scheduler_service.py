@@ -4,6 +4,7 @@ Background Scheduler Service
 Handles periodic tasks:
 - RSS feed updates every 15 minutes
 - Content refresh notifications
+- Related-content precomputation every hour
 """
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -13,6 +14,7 @@ import asyncio
 import logging
 
 from app.services.content_refresh import content_refresh
+from app.services.related_content import refresh_related_content
 from app.db import AsyncSessionLocal
 
 # Setup logger
@@ -40,6 +42,13 @@ class SchedulerService:
         except Exception as e:
             logger.error(f"[ERROR] Error in scheduled content refresh: {e}")
 
+    async def refresh_related_job(self):
+        """Job to precompute related content for new and stale items"""
+        try:
+            await refresh_related_content()
+        except Exception as e:
+            logger.error(f"[ERROR] Error precomputing related content: {e}")
+
     def start(self):
         """Start the scheduler"""
         if self.is_running:
@@ -54,6 +63,14 @@ class SchedulerService:
             name='Content Refresh Job',
             replace_existing=True
         )
+
+        self.scheduler.add_job(
+            self.refresh_related_job,
+            trigger=IntervalTrigger(hours=1),
+            id='related_content',
+            name='Related Content Job',
+            replace_existing=True
+        )
         
         self.scheduler.start()
         self.is_running = True
@@ -1,15 +1,24 @@
-import uuid
+import logging
+import secrets
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession  # pyright: ignore[reportMissingImports]
-from sqlalchemy import select  # pyright: ignore[reportMissingImports]
-from app.models import UserSession, UserInteraction, ContentItem
+from sqlalchemy import (  # pyright: ignore[reportMissingImports]
+    select,
+    insert,
+    update,
+    func,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models import UserSession, UserInteraction, ContentItem, Topic
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 async def create_anonymous_session(db: AsyncSession, session_token: str = None):
     """Create or get an anonymous user session"""
     if not session_token:
-        session_token = str(uuid.uuid4())
+        session_token = secrets.token_urlsafe(16)
 
     # Check if session exists
     result = await db.execute(
@@ -33,6 +42,93 @@ async def create_anonymous_session(db: AsyncSession, session_token: str = None):
     return session
 
 
+async def _touch_session(db: AsyncSession, session_token: str) -> int:
+    """Create the anonymous session or bump its last_activity; returns its id."""
+    now = datetime.now(timezone.utc)
+    stmt = pg_insert(UserSession).values(
+        session_token=session_token,
+        created_at=now,
+        expires_at=now + timedelta(days=30),  # 30-day session
+        last_activity=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserSession.session_token],
+        set_={"last_activity": stmt.excluded.last_activity},
+    ).returning(UserSession.id)
+    result = await db.execute(stmt)
+    return result.scalar_one()
+
+
+async def record_interactions_bulk(db: AsyncSession, events: list[dict]) -> int:
+    """Write buffered anonymous interactions in three statements.
+
+    Events for content items that don't exist (made-up or since-deleted ids)
+    are skipped, so one bad id can't fail the foreign key for the whole
+    batch.
+
+    Args:
+        db: Database session
+        events: Dicts with session_token, content_item_id, interaction_type,
+            duration_seconds and created_at
+
+    Returns:
+        Number of interactions written
+    """
+    if not events:
+        return 0
+
+    content_ids = {event["content_item_id"] for event in events}
+    existing_ids = set(
+        (
+            await db.execute(
+                select(ContentItem.id).where(ContentItem.id.in_(content_ids))
+            )
+        ).scalars()
+    )
+    if len(existing_ids) < len(content_ids):
+        events = [e for e in events if e["content_item_id"] in existing_ids]
+        if not events:
+            return 0
+
+    # Create/touch every session in the batch with one multi-row upsert
+    now = datetime.now(timezone.utc)
+    tokens = {event["session_token"] for event in events}
+    stmt = pg_insert(UserSession).values(
+        [
+            {
+                "session_token": token,
+                "created_at": now,
+                "expires_at": now + timedelta(days=30),  # 30-day session
+                "last_activity": now,
+            }
+            for token in tokens
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserSession.session_token],
+        set_={"last_activity": stmt.excluded.last_activity},
+    ).returning(UserSession.session_token, UserSession.id)
+    session_ids = dict((await db.execute(stmt)).all())
+
+    # executemany insert of the interactions
+    await db.execute(
+        insert(UserInteraction),
+        [
+            {
+                "user_id": None,  # NULL for anonymous users
+                "session_id": session_ids[event["session_token"]],
+                "content_item_id": event["content_item_id"],
+                "interaction_type": event["interaction_type"],
+                "duration_seconds": event["duration_seconds"],
+                "created_at": event["created_at"],
+            }
+            for event in events
+        ],
+    )
+    await db.commit()
+    return len(events)
+
+
 async def track_content_interaction(
     db: AsyncSession,
     session_token: str,
@@ -50,55 +146,91 @@ async def track_content_interaction(
         interaction_type: Type of interaction (view, click, interest_high, etc.)
         duration_seconds: Duration of interaction in seconds
         metadata: Optional metadata dict (currently logged but not stored in DB)
-    """
-    # Get or create session
-    session = await create_anonymous_session(db, session_token)
 
-    # Update last activity
-    session.last_activity = datetime.now(timezone.utc)
+    Returns:
+        ID of the inserted (or, for repeat views, updated) interaction
+    """
+    # Get or create session and update last activity in one statement
+    session_id = await _touch_session(db, session_token)
 
     # Record interaction
-    interaction = UserInteraction(
+    stmt = pg_insert(UserInteraction).values(
         user_id=None,  # NULL for anonymous users
-        session_id=session.id,  # Link to session for anonymous users
+        session_id=session_id,  # Link to session for anonymous users
         content_item_id=content_item_id,
         interaction_type=interaction_type,
         duration_seconds=duration_seconds,
         created_at=datetime.now(timezone.utc),
     )
+    # A view is stored once per session and item (partial unique index);
+    # repeat views keep the longest duration seen
+    if interaction_type == "view":
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                UserInteraction.session_id,
+                UserInteraction.content_item_id,
+            ],
+            index_where=UserInteraction.interaction_type == "view",
+            set_={
+                "duration_seconds": func.greatest(
+                    UserInteraction.duration_seconds, stmt.excluded.duration_seconds
+                )
+            },
+        )
 
     # Log metadata for future analysis (not stored in DB yet)
     if metadata:
-        print(f"Interest tracking metadata for content {content_item_id}: {metadata}")
+        logger.debug(
+            "Interest tracking metadata for content %s: %s", content_item_id, metadata
+        )
 
-    db.add(interaction)
+    result = await db.execute(stmt.returning(UserInteraction.id))
     await db.commit()
 
-    return interaction
+    return result.scalar_one()
 
 
 async def get_session_history(db: AsyncSession, session_token: str):
-    """Get content history for a session"""
+    """
+    Get content history for a session as plain dicts.
+
+    Only the columns the history view shows are selected (no content_text or
+    image_data), so the result serializes directly without ORM objects.
+    """
     result = await db.execute(
-        select(UserInteraction, ContentItem)
+        select(
+            ContentItem.id,
+            ContentItem.title,
+            ContentItem.slug,
+            ContentItem.content_type,
+            Topic.id.label("topic_id"),
+            Topic.title.label("topic_title"),
+            UserInteraction.interaction_type,
+            UserInteraction.created_at,
+            UserInteraction.duration_seconds,
+        )
         .join(ContentItem, UserInteraction.content_item_id == ContentItem.id)
+        .outerjoin(Topic, ContentItem.topic_id == Topic.id)
         .join(UserSession, UserInteraction.session_id == UserSession.id)
         .where(UserSession.session_token == session_token)
         .order_by(UserInteraction.created_at.desc())
     )
 
-    history = []
-    for interaction, content in result:
-        history.append(
-            {
-                "content": content,
-                "interaction_type": interaction.interaction_type,
-                "viewed_at": interaction.created_at,
-                "duration_seconds": interaction.duration_seconds,
-            }
-        )
-
-    return history
+    return [
+        {
+            "content": {
+                "id": row.id,
+                "title": row.title,
+                "slug": row.slug,
+                "content_type": row.content_type,
+                "topic": {"id": row.topic_id, "title": row.topic_title},
+            },
+            "interaction_type": row.interaction_type,
+            "viewed_at": row.created_at,
+            "duration_seconds": row.duration_seconds,
+        }
+        for row in result
+    ]
 
 
 async def migrate_session_to_user(db: AsyncSession, session_token: str, user_id: int):
@@ -127,31 +259,28 @@ async def migrate_session_to_user(db: AsyncSession, session_token: str, user_id:
 async def update_interaction_duration(
     db: AsyncSession, session_token: str, content_item_id: int, duration_seconds: int
 ):
-    """Update the duration of the most recent interaction for this content"""
-    # Get the session
-    session_result = await db.execute(
-        select(UserSession).where(UserSession.session_token == session_token)
-    )
-    session = session_result.scalar_one_or_none()
-
-    if not session:
-        return None
+    """
+    Update the duration of the most recent interaction for this content.
 
-    # Find the most recent interaction for this content in this session
-    interaction_result = await db.execute(
-        select(UserInteraction)
-        .where(UserInteraction.session_id == session.id)
+    Single UPDATE ... RETURNING; returns the interaction id, or None when the
+    session has no interaction with this item.
+    """
+    latest_id = (
+        select(UserInteraction.id)
+        .join(UserSession, UserInteraction.session_id == UserSession.id)
+        .where(UserSession.session_token == session_token)
         .where(UserInteraction.content_item_id == content_item_id)
         .order_by(UserInteraction.created_at.desc())
         .limit(1)
+        .scalar_subquery()
     )
-
-    interaction = interaction_result.scalar_one_or_none()
-
-    if interaction:
-        interaction.duration_seconds = duration_seconds
-        await db.commit()
-        await db.refresh(interaction)
-        return interaction
-
-    return None
+    result = await db.execute(
+        update(UserInteraction)
+        .where(UserInteraction.id == latest_id)
+        .values(duration_seconds=duration_seconds)
+        .returning(UserInteraction.id)
+        .execution_options(synchronize_session=False)
+    )
+    interaction_id = result.scalar_one_or_none()
+    await db.commit()
+    return interaction_id
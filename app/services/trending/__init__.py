@@ -51,10 +51,20 @@ class TrendingService:
             db, trends, self.GOOGLE_TRENDS_TAG
         )
 
+        from app.core.cache import TOPICS_CACHE_PREFIX, response_cache
+
+        # Trend scores and new topics change every cached topic page
+        await response_cache.clear(TOPICS_CACHE_PREFIX)
+
         # Trigger WebSocket notification if new content was created
         if new_content_count > 0:
+            # Cached feed pages and related items no longer reflect the newest items
+            from app.core.cache import FEED_CACHE_PREFIX, RELATED_CACHE_PREFIX
+
+            await response_cache.clear(FEED_CACHE_PREFIX)
+            await response_cache.clear(RELATED_CACHE_PREFIX)
             try:
-                from app.api.v1.routes.websocket import notify_new_content
+                from app.services.websocket_manager import notify_new_content
 
                 await notify_new_content(count=new_content_count)
                 print(f"[INFO] Notified clients of {new_content_count} new items")
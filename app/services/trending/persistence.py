@@ -9,7 +9,7 @@ from sqlalchemy import select
 from app.models import Topic, ContentItem
 from app.services.deduplication import deduplication_service
 from app.services.article_scraper import article_scraper
-from app.utils.slug import generate_slug, generate_slug_from_url
+from app.utils.slug import generate_slug, generate_slug_from_url, normalize_topic_title
 from app.db import AsyncSessionLocal
 
 
@@ -163,7 +163,7 @@ class TrendingPersistence:
 
     async def _process_single_trend(self, db: AsyncSession, trend_data: Dict, google_trends_tag: str) -> tuple:
         """Process a single trend. Returns (topic, is_new)"""
-        normalized_title = trend_data["title"].lower().replace(" ", "_")[:190]
+        normalized_title = normalize_topic_title(trend_data["title"])[:190]
         print(f"Processing trend: {trend_data['title']}")
 
         result = await db.execute(select(Topic).where(Topic.normalized_title == normalized_title))
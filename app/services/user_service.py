@@ -1,6 +1,7 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import exists, select, func, or_
 from app.models import User, UserInterestProfile, UserInteraction
 from app.core.auth import get_password_hash, verify_password
 from app.schemas import UserCreate, UserPreferences, UserProfile, UserStats
@@ -16,13 +17,34 @@ async def get_user_by_email(db: AsyncSession, email: str):
     return result.scalar_one_or_none()
 
 
+async def email_exists(db: AsyncSession, email: str) -> bool:
+    """Whether an account uses this email (EXISTS probe, no row fetched)."""
+    return await db.scalar(select(exists().where(User.email == email)))
+
+
+async def get_user_by_username_or_email(db: AsyncSession, identifier: str):
+    """Resolve a user by username or email in a single query.
+
+    A username match wins if the identifier matches one user's username and
+    another user's email.
+    """
+    result = await db.execute(
+        select(User)
+        .where(or_(User.username == identifier, User.email == identifier))
+        .order_by((User.username == identifier).desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
 async def create_user(db: AsyncSession, user: UserCreate):
     import logging
 
     logger = logging.getLogger("uvicorn.error")
     # Pass password as string directly to bcrypt_sha256
     logger.warning(f"Password length (characters): {len(user.password)}")
-    hashed_password = get_password_hash(user.password)
+    # bcrypt is CPU-bound; hash in a worker thread so the event loop stays free
+    hashed_password = await asyncio.to_thread(get_password_hash, user.password)
     db_user = User(
         username=user.username, email=user.email, hashed_password=hashed_password
     )
@@ -36,7 +58,7 @@ async def authenticate_user(db: AsyncSession, username: str, password: str):
     user = await get_user_by_username(db, username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await asyncio.to_thread(verify_password, password, user.hashed_password):
         return False
     return user
 
@@ -60,8 +82,9 @@ async def update_user_profile(
     user_profile.social_links = profile.social_links
     user_profile.expertise = profile.expertise
 
+    # Only the profile row changes and sessions don't expire on commit, so
+    # the loaded user needs no refresh SELECT
     await db.commit()
-    await db.refresh(user)
     return user
 
 
@@ -93,18 +116,22 @@ async def get_user_stats(db: AsyncSession, user_id: int, timeframe: str) -> User
     elif timeframe == "30d":
         start_time = now - timedelta(days=30)
     else:  # "all"
-        start_time = datetime.min
+        start_time = None
+
+    # All aggregation runs in SQL; only a handful of rows come back
+    in_range = [UserInteraction.user_id == user_id]
+    if start_time is not None:
+        in_range.append(UserInteraction.created_at >= start_time)
 
-    # Get interaction counts
+    # Get interaction counts (and the first interaction, for "all")
     interactions_query = select(
         func.count().label("total"),
         func.count().filter(UserInteraction.interaction_type == "view").label("views"),
         func.count()
         .filter(UserInteraction.interaction_type == "follow")
         .label("follows"),
-    ).where(
-        UserInteraction.user_id == user_id, UserInteraction.created_at >= start_time
-    )
+        func.min(UserInteraction.created_at).label("first_at"),
+    ).where(*in_range)
     result = await db.execute(interactions_query)
     counts = result.first()
 
@@ -114,11 +141,7 @@ async def get_user_stats(db: AsyncSession, user_id: int, timeframe: str) -> User
         .select_from(UserInteraction)
         .join(ContentItem, UserInteraction.content_item_id == ContentItem.id)
         .join(Topic, ContentItem.topic_id == Topic.id)
-        .where(
-            UserInteraction.user_id == user_id,
-            UserInteraction.created_at >= start_time,
-            Topic.category.isnot(None),
-        )
+        .where(*in_range, Topic.category.isnot(None))
         .group_by(Topic.category)
         .order_by(func.count().desc())
         .limit(5)
@@ -132,9 +155,7 @@ async def get_user_stats(db: AsyncSession, user_id: int, timeframe: str) -> User
             func.date_trunc("day", UserInteraction.created_at).label("day"),
             func.count().label("count"),
         )
-        .where(
-            UserInteraction.user_id == user_id, UserInteraction.created_at >= start_time
-        )
+        .where(*in_range)
         .group_by(func.date_trunc("day", UserInteraction.created_at))
         .order_by("day")
     )
@@ -142,7 +163,10 @@ async def get_user_stats(db: AsyncSession, user_id: int, timeframe: str) -> User
     daily_activity = {str(row.day.date()): row.count for row in daily_result}
 
     # Calculate engagement score (views + 2*follows / days)
-    days = (now - start_time).days or 1  # avoid division by zero
+    # "all" spans from the first interaction rather than datetime.min (which
+    # is naive and can't be subtracted from an aware now)
+    since = start_time or counts.first_at or now
+    days = (now - since).days or 1  # avoid division by zero
     engagement = (counts.views + 2 * counts.follows) / days
 
     return UserStats(
@@ -150,6 +174,6 @@ async def get_user_stats(db: AsyncSession, user_id: int, timeframe: str) -> User
         content_views=counts.views,
         topic_follows=counts.follows,
         average_engagement=engagement,
-        favorite_categories=top_categories,
+        favorite_categories=list(top_categories),
         activity_by_day=daily_activity,
     )
@@ -0,0 +1,170 @@
+"""
+WebSocket Connection Manager
+
+Tracks the live feed sockets and pushes JSON messages to them. Each
+connection gets a bounded outgoing queue drained by its own writer task, so
+broadcasting never waits on a socket.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Set
+
+import orjson
+from fastapi import WebSocket
+
+from app.services.reboot_manager import reboot_manager
+
+logger = logging.getLogger(__name__)
+
+# Messages buffered per client; a client that falls this far behind is dropped
+CLIENT_QUEUE_SIZE = 32
+# A client whose socket can't take one frame within this long is dropped
+CLIENT_SEND_TIMEOUT = 5.0
+
+
+class ConnectionManager:
+    """
+    Tracks feed sockets. Each connection gets a bounded outgoing queue
+    drained by its own writer task, so broadcasting is a non-blocking
+    enqueue and a slow client only ever delays itself.
+    """
+
+    def __init__(self):
+        self.active_connections: Set[WebSocket] = set()
+        self._queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
+        # close() calls for dropped clients, referenced until they finish
+        self._closing: Set[asyncio.Task] = set()
+
+    async def connect(self, websocket: WebSocket):
+        await websocket.accept()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self._queues[websocket] = queue
+        self._writers[websocket] = asyncio.create_task(self._writer(websocket, queue))
+        self.active_connections.add(websocket)
+        reboot_manager.register_connection()
+        logger.debug(
+            "WebSocket connected. Total connections: %d", len(self.active_connections)
+        )
+
+    def disconnect(self, websocket: WebSocket):
+        # A socket dropped by broadcast is disconnected again when its
+        # handler exits; only the first call counts
+        if websocket not in self.active_connections:
+            return
+        self.active_connections.discard(websocket)
+        self._queues.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+        reboot_manager.unregister_connection()
+        logger.debug(
+            "WebSocket disconnected. Total connections: %d",
+            len(self.active_connections),
+        )
+
+    def enqueue(self, websocket: WebSocket, text: str) -> bool:
+        """Queue a text frame for one client; drops the client if it lags"""
+        queue = self._queues.get(websocket)
+        if queue is None:
+            return False
+        try:
+            queue.put_nowait(text)
+        except asyncio.QueueFull:
+            self._drop(websocket, "outgoing queue full")
+            return False
+        return True
+
+    def _drop(self, websocket: WebSocket, reason: str):
+        """
+        Disconnect a lagging or broken client and close its socket.
+
+        The close ends the handler's receive loop and makes the browser
+        reconnect; without it the client would stay connected but never get
+        another message. The socket may be mid-frame after a timed-out send,
+        so it is not reused either way.
+        """
+        if websocket not in self.active_connections:
+            return
+        logger.warning("Dropping client: %s", reason)
+        self.disconnect(websocket)
+        task = asyncio.create_task(self._close(websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=1011), timeout=CLIENT_SEND_TIMEOUT
+            )
+        except Exception as e:
+            # uvicorn's ping timeout still tears down a dead transport
+            logger.debug("Closing dropped client failed: %s", e)
+
+    def broadcast(self, message: dict):
+        """Send message to all connected clients"""
+        # Encode once (text frames: clients JSON.parse(event.data)) and hand
+        # the same str to every writer; the snapshot is needed because
+        # enqueue may disconnect laggards mid-loop
+        text = orjson.dumps(message).decode()
+        for connection in list(self.active_connections):
+            self.enqueue(connection, text)
+
+    def send_personal_message(self, message: dict, websocket: WebSocket):
+        """Send message to specific client"""
+        self.enqueue(websocket, orjson.dumps(message).decode())
+
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Drain one client's queue; the only task that writes to its socket"""
+        while True:
+            text = await queue.get()
+            try:
+                await asyncio.wait_for(
+                    websocket.send_text(text), timeout=CLIENT_SEND_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                self._drop(websocket, "send timed out")
+                return
+            except Exception as e:
+                self._drop(websocket, f"send failed ({e})")
+                return
+
+
+manager = ConnectionManager()
+
+# (epoch second, ISO string) of the last formatted timestamp
+_timestamp_cache: tuple[int, str] = (-1, "")
+
+
+def now_iso() -> str:
+    """Local time as ISO 8601 at second precision, formatted once per second.
+
+    Connect storms and broadcasts stamp every message; clients only display
+    the value, so sub-second precision isn't needed.
+    """
+    global _timestamp_cache
+    second = int(time.time())
+    if _timestamp_cache[0] != second:
+        _timestamp_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _timestamp_cache[1]
+
+
+async def notify_new_content(count: int = 1, category: str = None):
+    """
+    Notify all connected clients about new content
+
+    Args:
+        count: Number of new content items
+        category: Optional category filter
+    """
+    message = {
+        "type": "new_content",
+        "count": count,
+        "category": category,
+        "timestamp": now_iso(),
+    }
+    manager.broadcast(message)
+    logger.info("Broadcasted new content notification: %d items", count)
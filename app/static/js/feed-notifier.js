@@ -177,7 +177,7 @@ class FeedNotifier {
             this.ws.onopen = () => {
                 // ...existing code...
                 this.reconnectAttempts = 0;
-                this.startHeartbeat();
+                // Liveness is handled by the server's protocol-level pings
             };
             this.ws.onmessage = (event) => {
                 try {
@@ -192,7 +192,6 @@ class FeedNotifier {
             };
             this.ws.onclose = () => {
                 // ...existing code...
-                this.stopHeartbeat();
                 this.attemptReconnect();
             };
         } catch (error) {
@@ -271,21 +270,6 @@ class FeedNotifier {
         }
     }
     
-    startHeartbeat() {
-        this.heartbeatInterval = setInterval(() => {
-            if (this.ws && this.ws.readyState === WebSocket.OPEN) {
-                this.ws.send('ping');
-            }
-        }, 30000); // Ping every 30 seconds
-    }
-    
-    stopHeartbeat() {
-        if (this.heartbeatInterval) {
-            clearInterval(this.heartbeatInterval);
-            this.heartbeatInterval = null;
-        }
-    }
-    
     attemptReconnect() {
         if (this.reconnectAttempts >= this.maxReconnectAttempts) {
             // ...existing code...
@@ -303,7 +287,6 @@ class FeedNotifier {
     }
     
     disconnect() {
-        this.stopHeartbeat();
         if (this.ws) {
             this.ws.close();
             this.ws = null;
@@ -5,6 +5,17 @@ import hashlib
 from typing import Optional
 
 
+def normalize_topic_title(title: str) -> str:
+    """
+    Topic.normalized_title for a title: lowercased, spaces to underscores.
+
+    Uses str.lower() (full Unicode case mapping) rather than an ASCII-only
+    translate table, so non-English titles normalize the same way they
+    always have.
+    """
+    return title.lower().replace(" ", "_")
+
+
 def generate_slug(title: str, content_id: Optional[int] = None) -> str:
     """
     Generate a unique slug from a title.
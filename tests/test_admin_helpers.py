@@ -0,0 +1,29 @@
+"""Tests for the pure helpers in app.api.v1.routes.admin"""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlalchemy")
+
+from app.api.v1.routes.admin import last_n_lines
+
+
+def test_last_n_lines_keeps_tail():
+    assert last_n_lines(b"a\nb\nc\nd\n", 2) == b"c\nd\n"
+
+
+def test_last_n_lines_without_trailing_newline():
+    assert last_n_lines(b"a\nb\nc", 2) == b"b\nc"
+
+
+def test_last_n_lines_more_than_available():
+    assert last_n_lines(b"a\nb\n", 10) == b"a\nb\n"
+
+
+def test_last_n_lines_single_line():
+    assert last_n_lines(b"only\n", 1) == b"only\n"
+
+
+def test_last_n_lines_zero_and_empty():
+    assert last_n_lines(b"a\nb\n", 0) == b""
+    assert last_n_lines(b"", 5) == b""
@@ -0,0 +1,36 @@
+"""Tests for the raw Cookie header parser used by AuthASGIMiddleware and deps"""
+
+import pytest
+
+pytest.importorskip("jose")
+pytest.importorskip("pydantic_settings")
+
+from app.middleware.auth_middleware import parse_cookie_fast, strip_bearer
+
+
+def test_extracts_only_auth_cookies():
+    header = b"theme=dark; access_token=abc; nexus_session=xyz; _ga=GA1.2"
+    assert parse_cookie_fast(header) == {"access_token": "abc", "nexus_session": "xyz"}
+
+
+def test_strips_surrounding_quotes():
+    header = b'access_token="Bearer abc.def.ghi"'
+    assert parse_cookie_fast(header) == {"access_token": "Bearer abc.def.ghi"}
+
+
+def test_skips_pairs_without_equals_sign():
+    assert parse_cookie_fast(b"garbage; nexus_session=s1;;") == {"nexus_session": "s1"}
+
+
+def test_value_may_contain_equals_sign():
+    assert parse_cookie_fast(b"nexus_session=a=b==") == {"nexus_session": "a=b=="}
+
+
+def test_custom_names():
+    header = b"access_token=abc; refresh_token=def"
+    assert parse_cookie_fast(header, (b"refresh_token",)) == {"refresh_token": "def"}
+
+
+def test_strip_bearer():
+    assert strip_bearer("Bearer abc") == "abc"
+    assert strip_bearer("abc") == "abc"
@@ -0,0 +1,55 @@
+"""Tests for the pure helpers in app.api.routes.content"""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("httpx")
+
+from app.api.routes.content import _build_tsquery_text, _feed_cache_key
+from app.core.cache import FEED_CACHE_PREFIX
+
+
+def test_tsquery_ors_lowercased_keywords():
+    assert _build_tsquery_text(["Ottawa", "Budget"]) == "ottawa | budget"
+
+
+def test_tsquery_drops_operator_characters():
+    assert _build_tsquery_text(["C++", "don't", "a&b|c!"]) == "c | dont | abc"
+
+
+def test_tsquery_skips_empty_terms():
+    assert _build_tsquery_text(["--", "!", "news"]) == "news"
+    assert _build_tsquery_text([]) == ""
+
+
+def test_feed_cache_key_is_prefixed_digest():
+    key = _feed_cache_key(1, 20, [5, 6], ["News"], None)
+    assert key.startswith(FEED_CACHE_PREFIX)
+    assert len(key) == len(FEED_CACHE_PREFIX) + 64
+
+
+def test_feed_cache_key_ignores_category_order():
+    assert _feed_cache_key(1, 20, [], ["A", "B"], None) == _feed_cache_key(
+        1, 20, [], ["B", "A"], None
+    )
+
+
+def test_feed_cache_key_treats_missing_values_as_empty():
+    assert _feed_cache_key(1, 20, None, None, None) == _feed_cache_key(
+        1, 20, [], [], ""
+    )
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        (2, 20, [], [], None),
+        (1, 10, [], [], None),
+        (1, 20, [7], [], None),
+        (1, 20, [], ["Sports"], None),
+        (1, 20, [], [], "2026-01-01T00:00:00"),
+    ],
+)
+def test_feed_cache_key_varies_with_each_input(args):
+    assert _feed_cache_key(*args) != _feed_cache_key(1, 20, [], [], None)
@@ -0,0 +1,45 @@
+"""Tests for InputValidator.validate_exclude_ids"""
+
+import pytest
+
+fastapi = pytest.importorskip("fastapi")
+
+from app.core.input_validation import (
+    MAX_EXCLUDE_IDS,
+    MAX_EXCLUDE_IDS_LENGTH,
+    InputValidator,
+)
+
+
+def test_empty_returns_no_ids():
+    assert InputValidator.validate_exclude_ids(None) == []
+    assert InputValidator.validate_exclude_ids("") == []
+
+
+def test_dedupes_preserving_order():
+    assert InputValidator.validate_exclude_ids("3, 1,3,2 ,1") == [3, 1, 2]
+
+
+def test_keeps_newest_ids_past_count_cap():
+    raw = ",".join(str(i) for i in range(1, MAX_EXCLUDE_IDS + 101))
+    ids = InputValidator.validate_exclude_ids(raw)
+    assert len(ids) == MAX_EXCLUDE_IDS
+    assert ids == list(range(101, MAX_EXCLUDE_IDS + 101))
+
+
+def test_length_cap_drops_cut_off_leading_id():
+    all_ids = [100000000 + i for i in range(2000)]
+    raw = ",".join(map(str, all_ids))
+    assert len(raw) > MAX_EXCLUDE_IDS_LENGTH
+
+    ids = InputValidator.validate_exclude_ids(raw)
+    assert len(ids) == MAX_EXCLUDE_IDS
+    assert ids[-1] == all_ids[-1]
+    assert set(ids) <= set(all_ids)
+
+
+@pytest.mark.parametrize("raw", ["1,2;3", "1,abc", "0", "1,9999999999"])
+def test_rejects_invalid_input(raw):
+    with pytest.raises(fastapi.HTTPException) as exc_info:
+        InputValidator.validate_exclude_ids(raw)
+    assert exc_info.value.status_code == 400
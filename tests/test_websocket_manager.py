@@ -0,0 +1,126 @@
+"""Tests for ConnectionManager's per-client queues and drop paths"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from app.services import websocket_manager
+from app.services.websocket_manager import CLIENT_QUEUE_SIZE, ConnectionManager
+
+
+class FakeWebSocket:
+    """Records frames and close codes; sends can be made to hang or fail"""
+
+    def __init__(self, send_error=None, hang=False):
+        self.sent = []
+        self.close_code = None
+        self.send_error = send_error
+        self.hang = hang
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.hang:
+            await asyncio.Event().wait()
+        if self.send_error is not None:
+            raise self.send_error
+        self.sent.append(text)
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+async def _settle():
+    """Let writer and close tasks run"""
+    await asyncio.sleep(0.01)
+
+
+def test_broadcast_sends_one_encoding_to_every_client():
+    async def scenario():
+        manager = ConnectionManager()
+        sockets = [FakeWebSocket(), FakeWebSocket()]
+        for ws in sockets:
+            await manager.connect(ws)
+
+        manager.broadcast({"type": "new_content", "count": 2})
+        await _settle()
+
+        assert [ws.sent for ws in sockets] == [['{"type":"new_content","count":2}']] * 2
+        for ws in sockets:
+            manager.disconnect(ws)
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_drops_and_closes_client():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = FakeWebSocket(hang=True)
+        await manager.connect(ws)
+
+        # The writer hasn't run yet, so nothing leaves the queue
+        for i in range(CLIENT_QUEUE_SIZE):
+            assert manager.enqueue(ws, str(i))
+        assert not manager.enqueue(ws, "overflow")
+
+        assert ws not in manager.active_connections
+        assert not manager.enqueue(ws, "after drop")
+        await _settle()
+        assert ws.close_code == 1011
+
+    asyncio.run(scenario())
+
+
+def test_send_timeout_drops_client(monkeypatch):
+    monkeypatch.setattr(websocket_manager, "CLIENT_SEND_TIMEOUT", 0.01)
+
+    async def scenario():
+        manager = ConnectionManager()
+        ws = FakeWebSocket(hang=True)
+        await manager.connect(ws)
+
+        manager.send_personal_message({"type": "ping"}, ws)
+        await asyncio.sleep(0.05)
+
+        assert ws not in manager.active_connections
+        assert ws.close_code == 1011
+
+    asyncio.run(scenario())
+
+
+def test_send_error_drops_only_that_client():
+    async def scenario():
+        manager = ConnectionManager()
+        broken = FakeWebSocket(send_error=RuntimeError("connection reset"))
+        healthy = FakeWebSocket()
+        await manager.connect(broken)
+        await manager.connect(healthy)
+
+        manager.broadcast({"n": 1})
+        await _settle()
+
+        assert manager.active_connections == {healthy}
+        assert broken.close_code == 1011
+        assert healthy.sent == ['{"n":1}']
+        manager.disconnect(healthy)
+
+    asyncio.run(scenario())
+
+
+def test_disconnect_is_idempotent():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        before = websocket_manager.reboot_manager.active_connections
+        await manager.connect(ws)
+
+        manager.disconnect(ws)
+        manager.disconnect(ws)
+
+        assert websocket_manager.reboot_manager.active_connections == before
+        assert not manager.enqueue(ws, "late")
+
+    asyncio.run(scenario())